@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'label-quotation',
-    'version': '19.0.1.0.0',
+    'version': '19.0.1.1.0',
     'category': 'Manufacturing',
     'summary': 'Label quotation system with product integration',
     'description': 'Advanced label quotation system with production optimization',
@@ -15,8 +15,21 @@
         'security/ir.model.access.csv',
         'data/product_categories.xml',
         'data/label_products.xml',
+        'data/ir_cron_data.xml',
+        'data/mail_activity_data.xml',
         'views/label_product_views.xml',
         'views/label_quotation_main_views.xml',
+        'views/label_quotation_views.xml',
+        'views/production_nesting_views.xml',
+        'views/production_schedule_views.xml',
+        'views/label_fustella_usage_views.xml',
+        'views/production_wizard_views.xml',
+        'views/production_report_views.xml',
+        'views/price_simulation_views.xml',
+        'views/quotation_sensitivity_views.xml',
+        'views/quotation_revision_views.xml',
+        'views/label_quotation_archive_views.xml',
+        'views/quotation_approval_views.xml',
     ],
     'installable': True,
     'application': True,
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from odoo import http
+from odoo.exceptions import AccessDenied
+from odoo.http import request
+
+from ..tools import get_timing_stats, reset_timing_stats, set_timing_enabled, is_timing_enabled
+
+
+class LabelQuotationTimingController(http.Controller):
+
+    def _check_admin(self):
+        if not request.env.user.has_group('base.group_system'):
+            raise AccessDenied()
+
+    @http.route('/label_quotation/timings', type='json', auth='user')
+    def timings(self, reset=False, enabled=None):
+        """Hot path timings of the worker serving the request
+
+        Each worker keeps its own figures; the worker pid is returned so
+        successive calls can be told apart.
+        """
+        self._check_admin()
+        if enabled is not None:
+            set_timing_enabled(enabled)
+        stats = get_timing_stats()
+        if reset:
+            reset_timing_stats()
+        return {
+            'pid': os.getpid(),
+            'enabled': is_timing_enabled(),
+            'stats': stats,
+        }
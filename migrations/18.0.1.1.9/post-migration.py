@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import time
+
+from odoo import api, SUPERUSER_ID
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 1000
+CHECKPOINT_KEY = 'label_quotation.product_migration.%s'
+
 
-def migrate(env, version):
-    """Migrate existing data to product-based system"""
+def migrate(cr, version):
+    """Migrate existing data to product-based system
+    
+    Active master data is moved in chunks: one anti-join query per chunk finds
+    the records without a product, the missing products are created in bulk and
+    the last processed id is committed as a checkpoint, so an interrupted
+    upgrade resumes where it stopped.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
     
     _logger.info("Starting migration to product-based label quotation system...")
     
@@ -93,196 +107,221 @@ def _create_product_categories(env):
         _logger.info("Created Label Services category")
 
 
-def _migrate_materials_to_products(env):
-    """Migrate existing label.carta records to product.template"""
-    
-    _logger.info("Migrating materials to products...")
+def _migrate_to_products(env, model, flag_field, code_prefix, category_name, prepare_vals):
+    """Chunked, resumable migration of one master data model to product.template
     
-    materials_category = env['product.category'].search([
-        ('name', '=', 'Label Materials')
-    ], limit=1)
-    
-    if not materials_category:
-        _logger.warning("Label Materials category not found, skipping material migration")
+    :param model: source model name (``label.carta``, ...)
+    :param flag_field: product.template boolean marking the product kind
+    :param code_prefix: default_code prefix for records without a code
+    :param category_name: product category of the created products
+    :param prepare_vals: function building product values from a source record
+    """
+    category = env['product.category'].search([('name', '=', category_name)], limit=1)
+    if not category:
+        _logger.warning("%s category not found, skipping %s migration", category_name, model)
         return
     
-    # Get all existing materials
-    materials = env['label.carta'].search([])
+    table = env[model]._table
+    params = env['ir.config_parameter'].sudo()
+    checkpoint_key = CHECKPOINT_KEY % model
+    last_id = int(params.get_param(checkpoint_key, 0))
+    if last_id:
+        _logger.info("Resuming %s migration after id %s", model, last_id)
     
-    for material in materials:
-        # Check if product already exists
-        existing_product = env['product.template'].search([
-            ('default_code', '=', material.code),
-            ('is_label_material', '=', True)
-        ], limit=1)
+    started = time.monotonic()
+    scanned = created = 0
+    while True:
+        chunk_started = time.monotonic()
+        # One anti-join per chunk: which records of the chunk have no product yet
+        env.cr.execute(SQL("""
+            WITH chunk AS (
+                SELECT id, COALESCE(NULLIF(code, ''), %s || id) AS default_code
+                  FROM %s
+                 WHERE active AND id > %s
+              ORDER BY id
+                 LIMIT %s
+            )
+            SELECT chunk.id,
+                   NOT EXISTS (
+                       SELECT 1
+                         FROM product_template product
+                        WHERE %s
+                          AND product.default_code = chunk.default_code
+                   )
+              FROM chunk
+          ORDER BY chunk.id
+        """, code_prefix, SQL.identifier(table), last_id, CHUNK_SIZE, SQL.identifier('product', flag_field)))
+        rows = env.cr.fetchall()
+        if not rows:
+            break
         
-        if existing_product:
-            _logger.info(f"Product for material {material.name} already exists, skipping")
-            continue
+        # Records of the chunk sharing a code get a single product
+        missing = env[model].browse()
+        vals_list = []
+        codes = set()
+        for record in env[model].browse([record_id for record_id, is_missing in rows if is_missing]):
+            vals = dict(prepare_vals(record), categ_id=category.id)
+            if vals['default_code'] in codes:
+                continue
+            codes.add(vals['default_code'])
+            missing += record
+            vals_list.append(vals)
+        created += _create_products(env, model, missing, vals_list)
         
-        # Create product from material
-        product_vals = {
-            'name': material.name,
-            'default_code': material.code or f"MAT_{material.id}",
-            'categ_id': materials_category.id,
-            'type': 'product',
-            'sale_ok': True,
-            'purchase_ok': True,
-            'list_price': material.cost_per_sqm or 0.0,
-            'standard_price': (material.cost_per_sqm or 0.0) * 0.8,  # 20% margin
-            'is_label_material': True,
-            'paper_type': material.paper_type,
-            'grammage': material.grammage,
-            'thickness': material.thickness,
-            'adhesive_type': material.adhesive_type,
-            'adhesive_strength': material.adhesive_strength,
-            'max_width': material.max_width,
-            'max_length': material.max_length,
-            'waste_factor': material.waste_factor,
-            'minimum_order_quantity': material.minimum_order_quantity,
-            'roll_width_standard': material.roll_width_standard,
-            'roll_length_standard': material.roll_length_standard,
-            'liner_type': material.liner_type,
-            'liner_thickness': material.liner_thickness,
-            'print_compatibility': material.print_compatibility,
-            'temperature_range_min': material.temperature_range_min,
-            'temperature_range_max': material.temperature_range_max,
-            'shelf_life_months': material.shelf_life_months,
-            'description': material.notes or f"Migrated from material {material.name}",
-        }
+        scanned += len(rows)
+        last_id = rows[-1][0]
+        params.set_param(checkpoint_key, last_id)
+        env.cr.commit()
+        env.invalidate_all()
         
+        elapsed = time.monotonic() - chunk_started
+        _logger.info(
+            "%s: %s scanned, %s products created (%.0f records/s)",
+            model, scanned, created, len(rows) / elapsed if elapsed else len(rows),
+        )
+    
+    params.set_param(checkpoint_key, False)
+    elapsed = time.monotonic() - started
+    _logger.info(
+        "Migrated %s: %s records scanned, %s products created in %.1fs (%.0f records/s)",
+        model, scanned, created, elapsed, scanned / elapsed if elapsed else scanned,
+    )
+
+
+def _create_products(env, model, records, vals_list):
+    """Bulk create products, falling back to one by one if the batch fails"""
+    if not vals_list:
+        return 0
+    try:
+        with env.cr.savepoint():
+            env['product.template'].create(vals_list)
+        return len(vals_list)
+    except Exception as e:
+        _logger.warning("Bulk product creation for %s failed (%s), retrying one by one", model, e)
+    
+    created = 0
+    for record, vals in zip(records, vals_list):
         try:
-            product = env['product.template'].create(product_vals)
-            _logger.info(f"Created product for material: {material.name}")
+            with env.cr.savepoint():
+                env['product.template'].create(vals)
+            created += 1
         except Exception as e:
-            _logger.error(f"Failed to create product for material {material.name}: {e}")
+            _logger.error("Failed to create product for %s %s: %s", model, record.name, e)
+    return created
+
+
+def _migrate_materials_to_products(env):
+    """Migrate existing label.carta records to product.template"""
+    
+    _logger.info("Migrating materials to products...")
+    _migrate_to_products(env, 'label.carta', 'is_label_material', 'MAT_', 'Label Materials', _prepare_material_vals)
+
+
+def _prepare_material_vals(material):
+    """Product values for a label.carta record"""
+    return {
+        'name': material.name,
+        'default_code': material.code or f"MAT_{material.id}",
+        'type': 'product',
+        'sale_ok': True,
+        'purchase_ok': True,
+        'list_price': material.cost_per_sqm or 0.0,
+        'standard_price': (material.cost_per_sqm or 0.0) * 0.8,  # 20% margin
+        'is_label_material': True,
+        'paper_type': material.paper_type,
+        'grammage': material.grammage,
+        'thickness': material.thickness,
+        'adhesive_type': material.adhesive_type,
+        'adhesive_strength': material.adhesive_strength,
+        'max_width': material.max_width,
+        'max_length': material.max_length,
+        'waste_factor': material.waste_factor,
+        'minimum_order_quantity': material.minimum_order_quantity,
+        'roll_width_standard': material.roll_width_standard,
+        'roll_length_standard': material.roll_length_standard,
+        'liner_type': material.liner_type,
+        'liner_thickness': material.liner_thickness,
+        'print_compatibility': material.print_compatibility,
+        'temperature_range_min': material.temperature_range_min,
+        'temperature_range_max': material.temperature_range_max,
+        'shelf_life_months': material.shelf_life_months,
+        'description': material.notes or f"Migrated from material {material.name}",
+    }
 
 
 def _migrate_machines_to_products(env):
     """Migrate existing label.macchina records to product.template"""
     
     _logger.info("Migrating machines to products...")
-    
-    machines_category = env['product.category'].search([
-        ('name', '=', 'Label Machines')
-    ], limit=1)
-    
-    if not machines_category:
-        _logger.warning("Label Machines category not found, skipping machine migration")
-        return
-    
-    # Get all existing machines
-    machines = env['label.macchina'].search([])
-    
-    for machine in machines:
-        # Check if product already exists
-        existing_product = env['product.template'].search([
-            ('default_code', '=', machine.code),
-            ('is_label_machine', '=', True)
-        ], limit=1)
-        
-        if existing_product:
-            _logger.info(f"Product for machine {machine.name} already exists, skipping")
-            continue
-        
-        # Create product from machine
-        product_vals = {
-            'name': machine.name,
-            'default_code': machine.code or f"MACH_{machine.id}",
-            'categ_id': machines_category.id,
-            'type': 'service',
-            'sale_ok': True,
-            'purchase_ok': False,
-            'list_price': machine.production_cost_per_hour or 0.0,
-            'standard_price': (machine.production_cost_per_hour or 0.0) * 0.8,
-            'is_label_machine': True,
-            'machine_type': machine.machine_type,
-            'manufacturer': machine.manufacturer,
-            'model': machine.model,
-            'max_speed': machine.max_speed,
-            'min_speed': machine.min_speed,
-            'max_web_width': machine.max_web_width,
-            'min_web_width': machine.min_web_width,
-            'setup_time': machine.setup_time,
-            'die_change_time': machine.die_change_time,
-            'material_change_time': machine.material_change_time,
-            'warm_up_time': machine.warm_up_time,
-            'max_tracks': machine.max_tracks,
-            'precision_rating': machine.precision_rating,
-            'quality_factor': machine.quality_factor,
-            'setup_cost_per_hour': machine.setup_cost_per_hour,
-            'production_cost_per_hour': machine.production_cost_per_hour,
-            'overhead_percentage': machine.overhead_percentage,
-            'efficiency_factor': machine.efficiency_factor,
-            'maintenance_cost_per_month': machine.maintenance_cost_per_month,
-            'depreciation_cost_per_month': machine.depreciation_cost_per_month,
-            'energy_cost_per_hour': machine.energy_cost_per_hour,
-            'operator_cost_per_hour': machine.operator_cost_per_hour,
-            'location': machine.location,
-            'description': machine.notes or f"Migrated from machine {machine.name}",
-        }
-        
-        try:
-            product = env['product.template'].create(product_vals)
-            _logger.info(f"Created product for machine: {machine.name}")
-        except Exception as e:
-            _logger.error(f"Failed to create product for machine {machine.name}: {e}")
+    _migrate_to_products(env, 'label.macchina', 'is_label_machine', 'MACH_', 'Label Machines', _prepare_machine_vals)
+
+
+def _prepare_machine_vals(machine):
+    """Product values for a label.macchina record"""
+    return {
+        'name': machine.name,
+        'default_code': machine.code or f"MACH_{machine.id}",
+        'type': 'service',
+        'sale_ok': True,
+        'purchase_ok': False,
+        'list_price': machine.production_cost_per_hour or 0.0,
+        'standard_price': (machine.production_cost_per_hour or 0.0) * 0.8,
+        'is_label_machine': True,
+        'machine_type': machine.machine_type,
+        'manufacturer': machine.manufacturer,
+        'model': machine.model,
+        'max_speed': machine.max_speed,
+        'min_speed': machine.min_speed,
+        'max_web_width': machine.max_web_width,
+        'min_web_width': machine.min_web_width,
+        'setup_time': machine.setup_time,
+        'die_change_time': machine.die_change_time,
+        'material_change_time': machine.material_change_time,
+        'warm_up_time': machine.warm_up_time,
+        'max_tracks': machine.max_tracks,
+        'precision_rating': machine.precision_rating,
+        'quality_factor': machine.quality_factor,
+        'setup_cost_per_hour': machine.setup_cost_per_hour,
+        'production_cost_per_hour': machine.production_cost_per_hour,
+        'overhead_percentage': machine.overhead_percentage,
+        'efficiency_factor': machine.efficiency_factor,
+        'maintenance_cost_per_month': machine.maintenance_cost_per_month,
+        'depreciation_cost_per_month': machine.depreciation_cost_per_month,
+        'energy_cost_per_hour': machine.energy_cost_per_hour,
+        'operator_cost_per_hour': machine.operator_cost_per_hour,
+        'location': machine.location,
+        'description': machine.notes or f"Migrated from machine {machine.name}",
+    }
 
 
 def _migrate_dies_to_products(env):
     """Migrate existing label.fustella records to product.template"""
     
     _logger.info("Migrating dies to products...")
-    
-    dies_category = env['product.category'].search([
-        ('name', '=', 'Label Dies')
-    ], limit=1)
-    
-    if not dies_category:
-        _logger.warning("Label Dies category not found, skipping die migration")
-        return
-    
-    # Get all existing dies
-    dies = env['label.fustella'].search([])
-    
-    for die in dies:
-        # Check if product already exists
-        existing_product = env['product.template'].search([
-            ('default_code', '=', die.code),
-            ('is_label_die', '=', True)
-        ], limit=1)
-        
-        if existing_product:
-            _logger.info(f"Product for die {die.name} already exists, skipping")
-            continue
-        
-        # Create product from die
-        product_vals = {
-            'name': die.name,
-            'default_code': die.code or f"DIE_{die.id}",
-            'categ_id': dies_category.id,
-            'type': 'service',
-            'sale_ok': True,
-            'purchase_ok': True,
-            'list_price': die.cost_per_use or 0.0,
-            'standard_price': (die.cost_per_use or 0.0) * 0.8,
-            'is_label_die': True,
-            'die_type': die.die_type,
-            'die_width': die.width,
-            'die_length': die.length,
-            'repeat_length': die.repeat_length,
-            'die_max_tracks': die.max_tracks,
-            'cutting_force_required': die.cutting_force_required,
-            'stripping_difficulty': die.stripping_difficulty,
-            'expected_lifetime_cuts': die.expected_lifetime_cuts,
-            'current_usage_count': die.current_usage_count,
-            'cost_per_use': die.cost_per_use,
-            'setup_time_die': die.setup_time,
-            'description': die.notes or f"Migrated from die {die.name}",
-        }
-        
-        try:
-            product = env['product.template'].create(product_vals)
-            _logger.info(f"Created product for die: {die.name}")
-        except Exception as e:
-            _logger.error(f"Failed to create product for die {die.name}: {e}")
+    _migrate_to_products(env, 'label.fustella', 'is_label_die', 'DIE_', 'Label Dies', _prepare_die_vals)
+
+
+def _prepare_die_vals(die):
+    """Product values for a label.fustella record"""
+    return {
+        'name': die.name,
+        'default_code': die.code or f"DIE_{die.id}",
+        'type': 'service',
+        'sale_ok': True,
+        'purchase_ok': True,
+        'list_price': die.cost_per_use or 0.0,
+        'standard_price': (die.cost_per_use or 0.0) * 0.8,
+        'is_label_die': True,
+        'die_type': die.die_type,
+        'die_width': die.width,
+        'die_length': die.length,
+        'repeat_length': die.repeat_length,
+        'die_max_tracks': die.max_tracks,
+        'cutting_force_required': die.cutting_force_required,
+        'stripping_difficulty': die.stripping_difficulty,
+        'expected_lifetime_cuts': die.expected_lifetime_cuts,
+        'current_usage_count': die.current_usage_count,
+        'cost_per_use': die.cost_per_use,
+        'setup_time_die': die.setup_time,
+        'description': die.notes or f"Migrated from die {die.name}",
+    }
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import sql_db
+from odoo.tools import SQL
+from odoo.tools.sql import index_exists, table_exists
+
+from odoo.addons.label_quotation.models.label_quotation import ANALYSIS_INDEXES
+
+_logger = logging.getLogger(__name__)
+
+TABLES = ['label_quotation', 'label_quotation_product']
+
+
+def migrate(cr, version):
+    """Build the quotation analysis indexes concurrently
+
+    CREATE INDEX CONCURRENTLY cannot run inside the upgrade transaction, so
+    the indexes are built on an autocommit cursor once the upgrade is
+    committed; quotations stay writable meanwhile.
+    """
+    if not version:
+        return
+
+    dbname = cr.dbname
+
+    def build_indexes():
+        with sql_db.db_connect(dbname).cursor() as index_cr:
+            index_cr._cnx.autocommit = True
+            for table in TABLES:
+                if not table_exists(index_cr, table):
+                    continue
+                for suffix, columns in ANALYSIS_INDEXES.items():
+                    indexname = f'{table}_{suffix}_index'
+                    if index_exists(index_cr, indexname):
+                        continue
+                    _logger.info("Building index %s concurrently...", indexname)
+                    try:
+                        index_cr.execute(SQL(
+                            "CREATE INDEX CONCURRENTLY %s ON %s (%s)",
+                            SQL.identifier(indexname),
+                            SQL.identifier(table),
+                            SQL(', ').join(SQL.identifier(column) for column in columns),
+                        ))
+                    except Exception:
+                        # A failed concurrent build leaves an invalid index behind
+                        _logger.exception("Could not build index %s", indexname)
+                        index_cr.execute(SQL("DROP INDEX IF EXISTS %s", SQL.identifier(indexname)))
+
+    cr.postcommit.add(build_indexes)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo.tools.sql import column_exists, create_column
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Backfill the newly stored cost fields in bulk
+
+    Creating the columns before the registry loads keeps the ORM from
+    recomputing depreciation_per_use, hourly_cost and setup_cost record by
+    record; a single UPDATE per table fills them with the same formulas as
+    the compute methods.
+    """
+    if not version:
+        return
+
+    _logger.info("Backfilling stored die depreciation and machine cost fields...")
+
+    if not column_exists(cr, 'label_fustella', 'depreciation_per_use'):
+        create_column(cr, 'label_fustella', 'depreciation_per_use', 'float8')
+    cr.execute("""
+        UPDATE label_fustella
+           SET depreciation_per_use = CASE
+                   WHEN expected_lifetime_cuts > 0
+                   THEN COALESCE(cost_per_use, 0) * 100 / expected_lifetime_cuts
+                   ELSE 0
+               END
+    """)
+    _logger.info("Backfilled depreciation_per_use on %s dies", cr.rowcount)
+
+    for column in ('depreciation_per_use', 'hourly_cost', 'setup_cost'):
+        if not column_exists(cr, 'product_template', column):
+            create_column(cr, 'product_template', column, 'float8')
+    cr.execute("""
+        UPDATE product_template
+           SET depreciation_per_use = CASE
+                   WHEN expected_lifetime_cuts > 0
+                   THEN COALESCE(cost_per_use, 0) * 100 / expected_lifetime_cuts
+                   ELSE 0
+               END,
+               hourly_cost = (COALESCE(production_cost_per_hour, 0)
+                              + COALESCE(energy_cost_per_hour, 0)
+                              + COALESCE(operator_cost_per_hour, 0))
+                             * (1 + COALESCE(overhead_percentage, 0) / 100),
+               setup_cost = CASE
+                   WHEN COALESCE(setup_time, 0) != 0 AND COALESCE(setup_cost_per_hour, 0) != 0
+                   THEN setup_time / 60 * setup_cost_per_hour
+                   ELSE 0
+               END
+    """)
+    _logger.info("Backfilled cost fields on %s product templates", cr.rowcount)
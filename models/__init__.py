@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+from . import run_profile_mixin
+from . import label_code_search_mixin
+from . import label_unique_code_mixin
 from . import label_config
 from . import label_carta
 from . import label_fustella
@@ -11,3 +14,14 @@ from . import production_report
 from . import label_product
 from . import label_quotation_product
 from . import data_creation
+from . import data_generator
+from . import roll_nesting
+from . import production_schedule
+from . import label_fustella_usage
+from . import sale_order
+from . import price_simulation
+from . import label_quotation_risk
+from . import quotation_sensitivity
+from . import quotation_revision
+from . import label_quotation_archive
+from . import quotation_approval
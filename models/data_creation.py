@@ -2,6 +2,17 @@
 
 from odoo import models, api, _
 
+UPSERT_BATCH_SIZE = 1000
+
+
+def _freeze(value):
+    """Hashable equivalent of a field value, to group identical changes"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class DataCreation(models.Model):
     _name = 'data.creation'
@@ -38,46 +49,21 @@ class DataCreation(models.Model):
         # Create categories if they don't exist
         categories_data = [
             {
-                'name': 'Label Materials',
-                'parent_id': main_category.id,
-            },
-            {
-                'name': 'Label Machines', 
-                'parent_id': main_category.id,
-            },
-            {
-                'name': 'Label Dies',
-                'parent_id': main_category.id,
-            },
-            {
-                'name': 'Label Services',
+                'name': name,
                 'parent_id': main_category.id,
             }
+            for name in ('Label Materials', 'Label Machines', 'Label Dies', 'Label Services')
         ]
-        
-        for cat_data in categories_data:
-            existing = self.env['product.category'].search([
-                ('name', '=', cat_data['name'])
-            ], limit=1)
-            
-            if not existing:
-                self.env['product.category'].create(cat_data)
+        self._bulk_upsert('product.category', categories_data, key='name', update=False)
     
     def _create_products(self):
         """Create products"""
         
         # Get categories
-        materials_cat = self.env['product.category'].search([
-            ('name', '=', 'Label Materials')
-        ], limit=1)
-        
-        machines_cat = self.env['product.category'].search([
-            ('name', '=', 'Label Machines')
-        ], limit=1)
-        
-        dies_cat = self.env['product.category'].search([
-            ('name', '=', 'Label Dies')
-        ], limit=1)
+        categories = self._get_category_map(['Label Materials', 'Label Machines', 'Label Dies'])
+        materials_cat = categories.get('Label Materials')
+        machines_cat = categories.get('Label Machines')
+        dies_cat = categories.get('Label Dies')
         
         if not all([materials_cat, machines_cat, dies_cat]):
             return
@@ -87,7 +73,7 @@ class DataCreation(models.Model):
             {
                 'name': 'Thermal FSC',
                 'default_code': 'CATEA02',
-                'categ_id': materials_cat.id,
+                'categ_id': materials_cat,
                 'type': 'product',
                 'sale_ok': True,
                 'purchase_ok': True,
@@ -107,7 +93,7 @@ class DataCreation(models.Model):
             {
                 'name': 'Vellum Neutro FSC',
                 'default_code': 'CAVA03',
-                'categ_id': materials_cat.id,
+                'categ_id': materials_cat,
                 'type': 'product',
                 'sale_ok': True,
                 'purchase_ok': True,
@@ -131,7 +117,7 @@ class DataCreation(models.Model):
             {
                 'name': 'Prati Vega Plus LF450',
                 'default_code': 'VEGA_LF450',
-                'categ_id': machines_cat.id,
+                'categ_id': machines_cat,
                 'type': 'service',
                 'sale_ok': True,
                 'purchase_ok': False,
@@ -158,7 +144,7 @@ class DataCreation(models.Model):
             {
                 'name': 'Rectangle 50x30mm',
                 'default_code': 'RECT_50_30',
-                'categ_id': dies_cat.id,
+                'categ_id': dies_cat,
                 'type': 'service',
                 'sale_ok': True,
                 'purchase_ok': True,
@@ -182,10 +168,108 @@ class DataCreation(models.Model):
         # Create all products
         all_products = materials_data + machines_data + dies_data
         
-        for product_data in all_products:
-            existing = self.env['product.template'].search([
-                ('default_code', '=', product_data['default_code'])
-            ], limit=1)
+        self._bulk_upsert('product.template', all_products, update=False)
+    
+    # Bulk seeding
+    @api.model
+    def load_dataset(self, dataset, update=True):
+        """Load a declarative catalog dataset with code-keyed upserts
+        
+        :param dataset: dict with optional ``categories``, ``materials``,
+            ``machines`` and ``dies`` lists of value dicts. Categories are keyed
+            by name, products by ``default_code``; products may give their
+            category by name under ``categ`` instead of ``categ_id``.
+        :param update: write changed values on existing records, otherwise
+            existing records are left untouched
+        :return: dict of ``{'created': n, 'updated': n}`` per dataset key
+        """
+        stats = {}
+        if dataset.get('categories'):
+            __, stats['categories'] = self._bulk_upsert(
+                'product.category', dataset['categories'], key='name', update=update)
+        
+        flags = {
+            'materials': {'is_label_material': True, 'type': 'product'},
+            'machines': {'is_label_machine': True, 'type': 'service'},
+            'dies': {'is_label_die': True, 'type': 'service'},
+        }
+        category_names = {
+            vals['categ']
+            for kind in flags for vals in dataset.get(kind, []) if vals.get('categ')
+        }
+        categories = self._get_category_map(category_names)
+        for kind, defaults in flags.items():
+            if not dataset.get(kind):
+                continue
+            vals_list = []
+            for vals in dataset[kind]:
+                vals = dict(defaults, **vals)
+                category_name = vals.pop('categ', None)
+                if category_name:
+                    vals['categ_id'] = categories[category_name]
+                vals_list.append(vals)
+            __, stats[kind] = self._bulk_upsert('product.template', vals_list, update=update)
+        return stats
+    
+    @api.model
+    def _get_category_map(self, names):
+        """Map category names to ids with a single query"""
+        return {
+            category['name']: category['id']
+            for category in self.env['product.category'].search_read([('name', 'in', list(names))], ['name'])
+        }
+    
+    @api.model
+    def _bulk_upsert(self, model_name, vals_list, key='default_code', update=True):
+        """Create or update records identified by ``key`` in batches
+        
+        Each batch costs one lookup on the key, one ``create`` for the new
+        records and one ``write`` per distinct set of changed values, so
+        constraints, overrides and recomputes all apply; records whose values
+        already match are not written at all.
+        Later duplicates of a key in ``vals_list`` win.
+        
+        :return: tuple of (records, ``{'created': n, 'updated': n}``)
+        """
+        Model = self.env[model_name]
+        records = Model.browse()
+        stats = {'created': 0, 'updated': 0}
+        
+        vals_by_key = {vals[key]: vals for vals in vals_list if vals.get(key)}
+        keys = list(vals_by_key)
+        field_names = sorted({name for vals in vals_by_key.values() for name in vals})
+        
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            batch = keys[start:start + UPSERT_BATCH_SIZE]
+            existing = {
+                row[key]: row
+                for row in Model.with_context(active_test=False).search_read(
+                    [(key, 'in', batch)], field_names if update else [key], load=None)
+            }
+            
+            to_create = [vals_by_key[code] for code in batch if code not in existing]
+            records |= Model.create(to_create)
+            stats['created'] += len(to_create)
             
-            if not existing:
-                self.env['product.template'].create(product_data)
+            records |= Model.browse([existing[code]['id'] for code in batch if code in existing])
+            if not update:
+                continue
+            
+            # Group identical changes so that each distinct write runs once
+            writes = {}
+            for code in batch:
+                row = existing.get(code)
+                if not row:
+                    continue
+                changes = {
+                    name: value for name, value in vals_by_key[code].items()
+                    if row.get(name) != value
+                }
+                if changes:
+                    frozen = tuple(sorted((name, _freeze(value)) for name, value in changes.items()))
+                    writes.setdefault(frozen, (changes, []))[1].append(row['id'])
+            for changes, ids in writes.values():
+                Model.browse(ids).write(changes)
+                stats['updated'] += len(ids)
+        
+        return records, stats
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
+
+
+class LabelDataGenerator(models.AbstractModel):
+    _name = 'label.data.generator'
+    _description = 'Synthetic Benchmark Data Generator'
+
+    # Job mix observed on the presses; weights are relative
+    STATE_WEIGHTS = {
+        'draft': 30,
+        'sent': 30,
+        'accepted': 20,
+        'rejected': 15,
+        'cancelled': 5,
+    }
+    TRACK_WEIGHTS = {1: 10, 2: 25, 3: 20, 4: 25, 5: 8, 6: 8, 8: 4}
+    INTERSPACES = [2.0, 3.0, 3.2, 4.0]
+
+    QUOTATION_COLUMNS = [
+        'name', 'partner_id', 'company_id', 'date', 'valid_until', 'state',
+        'label_width', 'label_height', 'interspace', 'tracks', 'total_quantity',
+        'carta_id', 'fustella_id', 'macchina_id', 'margin_percentage',
+        'create_uid', 'write_uid', 'create_date', 'write_date',
+    ]
+
+    @api.model
+    def generate(self, materials=20, machines=5, dies=100, quotations=10000,
+                 partners=500, seed=42, batch_size=10000, compute=True, prefix=None):
+        """Create a reproducible benchmark dataset
+
+        Master data goes through the ORM in one create per model; quotations
+        are inserted with multi-row INSERTs of ``batch_size`` rows and their
+        stored computes are then run batch by batch through the regular
+        compute methods, so the figures match what users would see. Every
+        quotation uses a die cut for its label size.
+
+        From a shell::
+
+            env['label.data.generator'].generate(quotations=1000000)
+
+        :param seed: the same seed always produces the same dataset
+        :param prefix: prefix of the generated codes and quotation numbers;
+            defaults to a token unique to the run, so that datasets can be
+            generated again next to the previous ones without clashing on
+            unique codes
+        :param compute: run the stored computes of the quotations; disable to
+            only measure raw insertion or to compute later
+        :return: dict with the created ids and timings
+        """
+        rng = random.Random(seed)
+        prefix = prefix or self._run_prefix()
+        started = time.monotonic()
+
+        partner_ids = self._generate_partners(rng, partners)
+        carta_ids = self._generate_materials(rng, materials, prefix)
+        macchina_ids = self._generate_machines(rng, machines, prefix)
+        fustella_ids = self._generate_dies(rng, dies, prefix)
+        masters_time = time.monotonic() - started
+        _logger.info("Generated master data in %.1fs", masters_time)
+
+        quotation_ids = self._generate_quotations(
+            rng, quotations, partner_ids, carta_ids, macchina_ids, fustella_ids, batch_size, prefix)
+        insert_time = time.monotonic() - started - masters_time
+        _logger.info(
+            "Inserted %s quotations in %.1fs (%.0f rows/s)",
+            len(quotation_ids), insert_time, len(quotation_ids) / insert_time if insert_time else 0,
+        )
+
+        compute_time = 0.0
+        if compute:
+            self._compute_quotations(quotation_ids, batch_size)
+            compute_time = time.monotonic() - started - masters_time - insert_time
+            _logger.info("Computed %s quotations in %.1fs", len(quotation_ids), compute_time)
+
+        return {
+            'partner_ids': partner_ids,
+            'carta_ids': carta_ids,
+            'macchina_ids': macchina_ids,
+            'fustella_ids': fustella_ids,
+            'quotation_ids': quotation_ids,
+            'timings': {
+                'masters': masters_time,
+                'insert': insert_time,
+                'compute': compute_time,
+            },
+        }
+
+    @api.model
+    def _run_prefix(self):
+        """Prefix unique to a generator run, from the current time in microseconds"""
+        return f'B{time.time_ns() // 1000:x}-'
+
+    # Master data
+    @api.model
+    def _generate_partners(self, rng, count):
+        """Customers the quotations are spread over"""
+        return self.env['res.partner'].create([
+            {'name': f'Benchmark Customer {index:05d}', 'customer_rank': 1}
+            for index in range(1, count + 1)
+        ]).ids
+
+    @api.model
+    def _generate_materials(self, rng, count, prefix):
+        """Papers with realistic grammage, widths and prices"""
+        paper_types = ['thermal', 'vellum', 'adhesive', 'plain', 'coated', 'recycled']
+        vals_list = []
+        for index in range(1, count + 1):
+            max_width = rng.choice([250, 330, 370, 425, 530])
+            vals_list.append({
+                'name': f'Benchmark Material {index:04d}',
+                'code': f'{prefix}MAT{index:04d}',
+                'paper_type': rng.choice(paper_types),
+                'grammage': round(rng.uniform(60, 180)),
+                'thickness': round(rng.uniform(60, 160)),
+                'max_width': max_width,
+                'roll_width_standard': max_width,
+                'roll_length_standard': rng.choice([1000, 2000, 4000]),
+                'cost_per_sqm': round(rng.lognormvariate(-0.6, 0.35), 3),
+                'waste_factor': round(rng.uniform(3, 8), 1),
+            })
+        return self.env['label.carta'].create(vals_list).ids
+
+    @api.model
+    def _generate_machines(self, rng, count, prefix):
+        """Presses with speeds, changeover times and hourly costs"""
+        machine_types = ['vega_plus', 'digicompact', 'flexo', 'digital']
+        vals_list = []
+        for index in range(1, count + 1):
+            vals_list.append({
+                'name': f'Benchmark Machine {index:03d}',
+                'code': f'{prefix}MAC{index:03d}',
+                'machine_type': rng.choice(machine_types),
+                'max_web_width': rng.choice([330, 400, 450]),
+                'max_speed': rng.choice([80, 150, 200, 300]),
+                'max_tracks': rng.choice([6, 8, 10]),
+                'efficiency_factor': round(rng.uniform(0.75, 0.92), 2),
+                'setup_time': rng.choice([20, 30, 45]),
+                'die_change_time': rng.choice([10, 15, 20]),
+                'material_change_time': rng.choice([5, 10, 15]),
+                'warm_up_time': rng.choice([5, 10]),
+                'setup_cost_per_hour': round(rng.uniform(40, 90), 2),
+                'production_cost_per_hour': round(rng.uniform(60, 140), 2),
+                'energy_cost_per_hour': round(rng.uniform(5, 20), 2),
+                'operator_cost_per_hour': round(rng.uniform(25, 45), 2),
+                'overhead_percentage': rng.choice([10, 15, 20]),
+            })
+        return self.env['label.macchina'].create(vals_list).ids
+
+    @api.model
+    def _generate_dies(self, rng, count, prefix):
+        """Dies sized like the labels they cut"""
+        die_types = ['flatbed', 'rotary', 'laser', 'kiss_cut']
+        difficulties = ['easy', 'medium', 'difficult', 'very_difficult']
+        vals_list = []
+        for index in range(1, count + 1):
+            width, height = self._label_size(rng)
+            lifetime = rng.choice([200000, 500000, 1000000, 2000000])
+            vals_list.append({
+                'name': f'Benchmark Die {index:05d} {width:.0f}x{height:.0f}',
+                'code': f'{prefix}DIE{index:05d}',
+                'die_type': rng.choice(die_types),
+                'width': width,
+                'length': height,
+                'repeat_length': round(height + rng.choice(self.INTERSPACES), 1),
+                'max_tracks': rng.choice([4, 6, 8, 10]),
+                'stripping_difficulty': rng.choices(difficulties, weights=[50, 30, 15, 5])[0],
+                'expected_lifetime_cuts': lifetime,
+                'current_usage_count': int(lifetime * rng.betavariate(2, 3)),
+                'cost_per_use': round(rng.uniform(0.2, 2.5), 2),
+                'setup_time': rng.choice([10, 15, 20]),
+            })
+        return self.env['label.fustella'].create(vals_list).ids
+
+    @api.model
+    def _label_size(self, rng):
+        """Label width and height in mm, log-normally spread around 60x40"""
+        width = min(max(rng.lognormvariate(4.1, 0.45), 15), 200)
+        height = min(max(rng.lognormvariate(3.7, 0.5), 10), 250)
+        return round(width), round(height)
+
+    # Quotations
+    @api.model
+    def _generate_quotations(self, rng, count, partner_ids, carta_ids, macchina_ids, fustella_ids, batch_size, prefix):
+        """Insert quotations with multi-row INSERTs and return their ids"""
+        if not count:
+            return []
+
+        # Labels take the size of the die that cuts them
+        die_sizes = {
+            die['id']: (die['width'], die['length'])
+            for die in self.env['label.fustella'].search_read([('id', 'in', fustella_ids)], ['width', 'length'])
+        }
+
+        states = list(self.STATE_WEIGHTS)
+        state_weights = list(self.STATE_WEIGHTS.values())
+        tracks = list(self.TRACK_WEIGHTS)
+        track_weights = list(self.TRACK_WEIGHTS.values())
+        today = fields.Date.context_today(self)
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        company_id = self.env.company.id
+        Quotation = self.env['label.quotation']
+        columns = SQL(', ').join(SQL.identifier(column) for column in self.QUOTATION_COLUMNS)
+
+        ids = []
+        for start in range(0, count, batch_size):
+            rows = []
+            for index in range(start + 1, min(start + batch_size, count) + 1):
+                fustella_id = rng.choice(fustella_ids)
+                width, height = die_sizes[fustella_id]
+                date = today - timedelta(days=int(rng.triangular(0, 730, 0)))
+                # Quantities cluster around 20k labels with a long tail of big runs
+                quantity = int(min(max(rng.lognormvariate(9.9, 1.1), 500), 5000000) // 500 * 500)
+                rows.append((
+                    f'{prefix}BENCH/{index:07d}',
+                    rng.choice(partner_ids),
+                    company_id,
+                    date,
+                    date + timedelta(days=30),
+                    rng.choices(states, weights=state_weights)[0],
+                    width,
+                    height,
+                    rng.choice(self.INTERSPACES),
+                    rng.choices(tracks, weights=track_weights)[0],
+                    quantity,
+                    rng.choice(carta_ids),
+                    fustella_id,
+                    rng.choice(macchina_ids),
+                    round(min(max(rng.gauss(30, 8), 5), 70), 1),
+                    uid, uid, now, now,
+                ))
+            # Each row tuple is adapted to a parenthesised list of values
+            self.env.cr.execute(SQL(
+                "INSERT INTO %s (%s) VALUES %s RETURNING id",
+                SQL.identifier(Quotation._table),
+                columns,
+                SQL(', ').join(SQL('%s', row) for row in rows),
+            ))
+            ids += [row[0] for row in self.env.cr.fetchall()]
+        return ids
+
+    @api.model
+    def _compute_quotations(self, quotation_ids, batch_size):
+        """Run the stored computes of inserted quotations batch by batch"""
+        Quotation = self.env['label.quotation']
+        fnames = [
+            name for name, field in Quotation._fields.items()
+            if field.store and field.compute and field.model_name == Quotation._name
+        ]
+        for batch_ids in split_every(batch_size, quotation_ids):
+            batch = Quotation.browse(batch_ids)
+            for fname in fnames:
+                self.env.add_to_compute(Quotation._fields[fname], batch)
+            batch.flush_recordset(fnames)
+            self.env.invalidate_all()
@@ -5,6 +5,7 @@ from odoo import models, fields, api, _
 
 class LabelCarta(models.Model):
     _name = 'label.carta'
+    _inherit = ['label.code.search.mixin', 'label.unique.code.mixin']
     _description = 'Paper Material'
     _rec_name = 'name'
     _order = 'name'
@@ -12,11 +13,13 @@ class LabelCarta(models.Model):
     name = fields.Char(
         string='Name',
         required=True,
+        index='trigram',
         help='Name of the paper material'
     )
     
     code = fields.Char(
         string='Code',
+        index='trigram',
         help='Internal code for the paper material'
     )
     
@@ -160,10 +163,18 @@ class LabelCarta(models.Model):
     @api.depends()
     def _compute_quotation_count(self):
         """Compute the number of quotations using this material"""
+        counts = dict(self.env['label.quotation']._read_group(
+            [('carta_id', 'in', self.ids)], ['carta_id'], ['__count']
+        ))
         for record in self:
-            record.quotation_count = self.env['label.quotation'].search_count([
-                ('carta_id', '=', record.id)
-            ])
+            record.quotation_count = counts.get(record, 0)
+    
+    def write(self, vals):
+        """Propagate renames to the order lines of quotations using the material"""
+        res = super().write(vals)
+        if 'name' in vals:
+            self.env['sale.order.line']._propagate_label_values(carta_ids=self.ids)
+        return res
     
     def action_view_quotations(self):
         """Action to view quotations using this material"""
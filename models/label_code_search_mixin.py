@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, api
+from odoo.tools import SQL
+from odoo.tools.sql import escape_psql
+
+_logger = logging.getLogger(__name__)
+
+
+class LabelCodeSearchMixin(models.AbstractModel):
+    """Name/code autocomplete backed by trigram indexes
+
+    Models using it declare ``name`` and ``code`` with ``index='trigram'``.
+    A code prefix is matched first: codes are short and selective, so the
+    dropdown usually fills from that query alone; name and code substrings
+    only complete the remaining slots.
+    """
+    _name = 'label.code.search.mixin'
+    _description = 'Code and Name Search'
+
+    _rec_names_search = ['name', 'code']
+
+    def init(self):
+        """Ensure the trigram indexes exist when pg_trgm is available
+
+        The ORM skips ``index='trigram'`` silently without the extension;
+        enable it when the database user may, then create the missing indexes.
+        A btree index the ORM created while the extension was missing is
+        replaced by the trigram one.
+        """
+        super().init()
+        if self._abstract:
+            return
+        cr = self.env.cr
+        cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if not cr.rowcount:
+            try:
+                with cr.savepoint():
+                    cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except Exception:
+                _logger.warning(
+                    "pg_trgm is not available, %s name/code search will not be indexed", self._name)
+                return
+
+        for fname in ('name', 'code'):
+            indexname = f'{self._table}__{fname}_index'
+            cr.execute(SQL(
+                """SELECT am.amname
+                     FROM pg_class AS idx
+                     JOIN pg_am AS am ON am.oid = idx.relam
+                    WHERE idx.relname = %s AND idx.relkind = 'i'""",
+                indexname,
+            ))
+            row = cr.fetchone()
+            if row and row[0] == 'gin':
+                continue
+            if row:
+                _logger.info("Replacing %s index %s by a trigram index", row[0], indexname)
+                cr.execute(SQL("DROP INDEX %s", SQL.identifier(indexname)))
+            cr.execute(SQL(
+                "CREATE INDEX %s ON %s USING gin (%s gin_trgm_ops)",
+                SQL.identifier(indexname), SQL.identifier(self._table), SQL.identifier(fname),
+            ))
+
+    @api.model
+    def name_search(self, name='', domain=None, operator='ilike', limit=100):
+        """Autocomplete with a code prefix fast path"""
+        if not name or operator != 'ilike' or not limit:
+            return super().name_search(name, domain, operator, limit)
+
+        domain = list(domain or [])
+        by_code = self.search_fetch(
+            domain + [('code', '=ilike', escape_psql(name) + '%')],
+            ['display_name'], limit=limit,
+        )
+        result = [(record.id, record.display_name) for record in by_code]
+        if len(result) < limit:
+            result += super().name_search(
+                name, domain + [('id', 'not in', by_code.ids)], operator, limit - len(result))
+        return result
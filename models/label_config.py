@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
 
+RISK_DISTRIBUTIONS = [
+    ('normal', 'Normal'),
+    ('triangular', 'Triangular'),
+    ('uniform', 'Uniform'),
+]
+
 
 class LabelConfig(models.Model):
     _name = 'label.config'
@@ -95,6 +101,67 @@ class LabelConfig(models.Model):
         help='Users who can approve large orders',
         check_company=True
     )
+    
+    # Sale Order Settings
+    sale_line_label_sync = fields.Selection([
+        ('live', 'Follow Quotation'),
+        ('snapshot', 'Snapshot at Confirmation'),
+    ], string='Order Line Label Values', default='live', required=True,
+        help='Follow Quotation: order lines always show the current quotation values.\n'
+             'Snapshot at Confirmation: confirmed order lines keep the values they had when confirmed.')
+
+    # Risk Analysis Settings
+    risk_trial_count = fields.Integer(
+        string='Risk Trials',
+        default=10000,
+        help='Monte Carlo trials run per quotation by the cost risk analysis'
+    )
+
+    risk_yield_distribution = fields.Selection(
+        RISK_DISTRIBUTIONS,
+        string='Yield Distribution',
+        default='normal',
+        required=True
+    )
+
+    risk_yield_spread = fields.Float(
+        string='Yield Spread (points)',
+        default=3.0,
+        help='Standard deviation (normal) or half-width (uniform, triangular) of the yield, in percentage points'
+    )
+
+    risk_efficiency_distribution = fields.Selection(
+        RISK_DISTRIBUTIONS,
+        string='Efficiency Distribution',
+        default='triangular',
+        required=True
+    )
+
+    risk_efficiency_spread = fields.Float(
+        string='Efficiency Spread (%)',
+        default=10.0,
+        help='Spread of the machine efficiency, relative to its nominal value'
+    )
+
+    risk_setup_distribution = fields.Selection(
+        RISK_DISTRIBUTIONS,
+        string='Setup Time Distribution',
+        default='triangular',
+        required=True
+    )
+
+    risk_setup_spread = fields.Float(
+        string='Setup Time Spread (%)',
+        default=25.0,
+        help='Spread of the setup time, relative to the quoted one'
+    )
+
+    # Archive Settings
+    archive_horizon_days = fields.Integer(
+        string='Archive After (days)',
+        default=730,
+        help='Closed quotations (accepted, rejected, cancelled or expired) older than this are moved to the archive; 0 disables archiving'
+    )
 
     # Computed fields
     @api.depends('company_id')
@@ -146,6 +213,22 @@ class LabelConfig(models.Model):
             if record.approval_threshold < 0:
                 raise ValidationError(_('Approval threshold cannot be negative.'))
 
+    @api.constrains('risk_trial_count', 'risk_yield_spread', 'risk_efficiency_spread', 'risk_setup_spread')
+    def _check_risk_settings(self):
+        """Validate risk analysis settings"""
+        for record in self:
+            if record.risk_trial_count <= 0:
+                raise ValidationError(_('Risk trials must be positive.'))
+            if min(record.risk_yield_spread, record.risk_efficiency_spread, record.risk_setup_spread) < 0:
+                raise ValidationError(_('Risk spreads cannot be negative.'))
+
+    @api.constrains('archive_horizon_days')
+    def _check_archive_horizon(self):
+        """Validate archive horizon"""
+        for record in self:
+            if record.archive_horizon_days < 0:
+                raise ValidationError(_('Archive horizon cannot be negative.'))
+
     @api.constrains('company_id')
     def _check_unique_company(self):
         """Ensure only one configuration per company"""
@@ -157,6 +240,24 @@ class LabelConfig(models.Model):
             if existing:
                 raise ValidationError(_('Only one configuration is allowed per company.'))
 
+    # CRUD
+    @api.model_create_multi
+    def create(self, vals_list):
+        configs = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return configs
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'company_id' in vals:
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
     # Model methods
     @api.model
     def get_config(self, company_id=None):
@@ -164,11 +265,17 @@ class LabelConfig(models.Model):
         if company_id is None:
             company_id = self.env.company.id
         
-        config = self.search([('company_id', '=', company_id)], limit=1)
+        config = self.browse(self._get_config_id(company_id))
         if not config:
             config = self.create({'company_id': company_id})
         return config
 
+    @api.model
+    @tools.ormcache('company_id')
+    def _get_config_id(self, company_id):
+        """Id of the company's configuration, cached until a configuration is added or removed"""
+        return self.sudo().search([('company_id', '=', company_id)], limit=1).id
+
     @api.model
     def get_default_margin(self, company_id=None):
         """Get default margin percentage"""
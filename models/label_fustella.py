@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import math
+from datetime import timedelta
+
 from odoo import models, fields, api, _
 
 
 class LabelFustella(models.Model):
     _name = 'label.fustella'
+    _inherit = ['label.code.search.mixin', 'label.unique.code.mixin']
     _description = 'Die Cutting Tool'
     _rec_name = 'name'
     _order = 'name'
@@ -12,11 +16,13 @@ class LabelFustella(models.Model):
     name = fields.Char(
         string='Name',
         required=True,
+        index='trigram',
         help='Name of the die cutting tool'
     )
     
     code = fields.Char(
         string='Code',
+        index='trigram',
         help='Internal code for the die'
     )
     
@@ -80,6 +86,48 @@ class LabelFustella(models.Model):
         default=0
     )
     
+    end_of_life_threshold = fields.Float(
+        string='End of Life Warning (%)',
+        default=90.0,
+        help='Share of the expected lifetime (used plus backlog) at which the die is flagged'
+    )
+    
+    usage_ids = fields.One2many(
+        'label.fustella.usage',
+        'fustella_id',
+        string='Usage Ledger'
+    )
+    
+    backlog_cuts = fields.Integer(
+        string='Backlog Cuts',
+        compute='_compute_wear_forecast',
+        store=True,
+        help='Cuts needed by accepted quotations not yet produced'
+    )
+    
+    remaining_cuts = fields.Integer(
+        string='Remaining Cuts',
+        compute='_compute_wear_forecast',
+        store=True,
+        help='Expected lifetime left once the accepted backlog is produced'
+    )
+    
+    forecast_replacement_date = fields.Date(
+        string='Forecast Replacement',
+        compute='_compute_wear_forecast',
+        store=True,
+        index=True,
+        help='Date at which the die is expected to reach its lifetime'
+    )
+    
+    near_end_of_life = fields.Boolean(
+        string='Near End of Life',
+        compute='_compute_wear_forecast',
+        store=True,
+        index=True,
+        help='Used plus backlog cuts exceed the end of life warning threshold'
+    )
+    
     cost_per_use = fields.Float(
         string='Cost per Use (€)',
         help='Cost per use of the die'
@@ -88,6 +136,8 @@ class LabelFustella(models.Model):
     depreciation_per_use = fields.Float(
         string='Depreciation per Use (€)',
         compute='_compute_depreciation_per_use',
+        store=True,
+        index=True,
         help='Depreciation cost per use based on lifetime'
     )
     
@@ -141,13 +191,80 @@ class LabelFustella(models.Model):
             else:
                 record.depreciation_per_use = 0.0
     
+    @api.depends('expected_lifetime_cuts', 'current_usage_count', 'end_of_life_threshold',
+                 'usage_ids.cuts', 'usage_ids.state', 'usage_ids.date')
+    def _compute_wear_forecast(self):
+        """Forecast die wear from the accepted backlog and recent usage
+
+        Backlog entries are consumed in date order until the lifetime is
+        exhausted; past the backlog, the last 90 days of registered usage
+        give the daily wear rate used to extrapolate. The window moves with
+        the date, so a daily cron refreshes the stored values.
+        """
+        today = fields.Date.context_today(self)
+        history_days = 90
+        
+        Usage = self.env['label.fustella.usage']
+        backlog_by_die = Usage.search([
+            ('fustella_id', 'in', self.ids),
+            ('state', '=', 'backlog'),
+        ]).grouped('fustella_id')
+        recent_cuts = dict(Usage._read_group(
+            [('fustella_id', 'in', self.ids), ('state', '=', 'done'),
+             ('date', '>=', today - timedelta(days=history_days))],
+            ['fustella_id'],
+            ['cuts:sum'],
+        ))
+        
+        for record in self:
+            backlog = backlog_by_die.get(record, Usage)
+            record.backlog_cuts = sum(backlog.mapped('cuts'))
+            
+            if not record.expected_lifetime_cuts:
+                record.remaining_cuts = 0
+                record.forecast_replacement_date = False
+                record.near_end_of_life = False
+                continue
+            
+            lifetime_left = record.expected_lifetime_cuts - record.current_usage_count
+            record.remaining_cuts = lifetime_left - record.backlog_cuts
+            record.near_end_of_life = (
+                record.current_usage_count + record.backlog_cuts
+                >= record.expected_lifetime_cuts * record.end_of_life_threshold / 100
+            )
+            
+            replacement_date = today if lifetime_left <= 0 else False
+            left = lifetime_left
+            for usage in backlog:
+                if replacement_date:
+                    break
+                left -= usage.cuts
+                if left <= 0:
+                    replacement_date = usage.date
+            
+            daily_rate = recent_cuts.get(record, 0) / history_days
+            if not replacement_date and daily_rate:
+                last_date = max(backlog.mapped('date') or [today])
+                replacement_date = last_date + timedelta(days=math.ceil(left / daily_rate))
+            
+            record.forecast_replacement_date = replacement_date
+    
+    @api.model
+    def _cron_recompute_wear_forecast(self):
+        """Refresh the stored wear forecast of dies with a lifetime to track"""
+        dies = self.search([('expected_lifetime_cuts', '>', 0)])
+        for fname in ('backlog_cuts', 'remaining_cuts', 'forecast_replacement_date', 'near_end_of_life'):
+            self.env.add_to_compute(self._fields[fname], dies)
+        dies.flush_recordset()
+    
     @api.depends()
     def _compute_quotation_count(self):
         """Compute the number of quotations using this die"""
+        counts = dict(self.env['label.quotation']._read_group(
+            [('fustella_id', 'in', self.ids)], ['fustella_id'], ['__count']
+        ))
         for record in self:
-            record.quotation_count = self.env['label.quotation'].search_count([
-                ('fustella_id', '=', record.id)
-            ])
+            record.quotation_count = counts.get(record, 0)
     
     def action_view_quotations(self):
         """Action to view quotations using this die"""
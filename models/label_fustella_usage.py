@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+from odoo import models, fields, api, _
+
+
+class LabelFustellaUsage(models.Model):
+    _name = 'label.fustella.usage'
+    _description = 'Die Usage Ledger'
+    _rec_name = 'quotation_name'
+    _order = 'date, id'
+
+    fustella_id = fields.Many2one(
+        'label.fustella',
+        string='Die',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    quotation_id = fields.Many2one(
+        'label.quotation',
+        string='Quotation',
+        ondelete='set null',
+        index=True,
+        help='Emptied when the quotation is archived; the entry and its cuts stay'
+    )
+
+    quotation_name = fields.Char(
+        string='Quotation Number',
+        readonly=True
+    )
+
+    quotation_date = fields.Date(
+        string='Quotation Date',
+        readonly=True
+    )
+
+    date = fields.Date(
+        string='Date',
+        required=True,
+        default=fields.Date.context_today,
+        index=True,
+        help='Production date of the job (planned date for backlog entries)'
+    )
+
+    cuts = fields.Integer(
+        string='Cuts',
+        help='Die cuts needed by the job'
+    )
+
+    state = fields.Selection([
+        ('backlog', 'Backlog'),
+        ('done', 'Done'),
+    ], string='Status', default='backlog', required=True, index=True)
+
+    @api.model
+    def _cuts_for_quotation(self, quotation):
+        """Die cuts of a job: one cut per die repeat over the linear length"""
+        repeat_length = quotation.fustella_id.repeat_length or (quotation.label_height + quotation.interspace)
+        if not repeat_length or not quotation.linear_length:
+            return 0
+        return math.ceil(quotation.linear_length * 1000 / repeat_length)
+
+    @api.model
+    def _sync_quotations(self, quotations):
+        """Rebuild the backlog entries of the given quotations
+
+        Accepted quotations get one backlog entry dated at their planned
+        start (today when unplanned); entries of other quotations are dropped.
+        Entries already registered as done are never touched. Entries keep the
+        quotation number and date, so they outlive the quotation's archiving.
+        """
+        self.search([('quotation_id', 'in', quotations.ids), ('state', '=', 'backlog')]).unlink()
+
+        accepted = quotations.filtered(lambda q: q.state == 'accepted' and q.fustella_id)
+        if not accepted:
+            return self.browse()
+
+        done_quotation_ids = set(self.search([
+            ('quotation_id', 'in', accepted.ids),
+            ('state', '=', 'done'),
+        ]).quotation_id.ids)
+
+        planned_starts = {
+            row['quotation_id'][0]: row['date_start']
+            for row in self.env['label.production.slot'].search_read(
+                [('quotation_id', 'in', accepted.ids)], ['quotation_id', 'date_start'])
+        }
+
+        today = fields.Date.context_today(self)
+        vals_list = []
+        for quotation in accepted:
+            if quotation.id in done_quotation_ids:
+                continue
+            planned = planned_starts.get(quotation.id)
+            vals_list.append({
+                'fustella_id': quotation.fustella_id.id,
+                'quotation_id': quotation.id,
+                'quotation_name': quotation.name,
+                'quotation_date': quotation.date,
+                'date': max(planned.date(), today) if planned else today,
+                'cuts': self._cuts_for_quotation(quotation),
+                'state': 'backlog',
+            })
+        return self.create(vals_list)
+
+    def action_register_usage(self):
+        """Mark backlog entries as produced and add their cuts to the dies"""
+        backlog = self.filtered(lambda u: u.state == 'backlog')
+        cuts_by_die = {}
+        for usage in backlog:
+            cuts_by_die[usage.fustella_id] = cuts_by_die.get(usage.fustella_id, 0) + usage.cuts
+
+        backlog.write({'state': 'done', 'date': fields.Date.context_today(self)})
+        for die, cuts in cuts_by_die.items():
+            die.current_usage_count += cuts
+        return True
@@ -5,6 +5,7 @@ from odoo import models, fields, api, _
 
 class LabelMacchina(models.Model):
     _name = 'label.macchina'
+    _inherit = ['label.code.search.mixin', 'label.unique.code.mixin']
     _description = 'Label Production Machine'
     _rec_name = 'name'
     _order = 'name'
@@ -12,11 +13,13 @@ class LabelMacchina(models.Model):
     name = fields.Char(
         string='Name',
         required=True,
+        index='trigram',
         help='Name of the production machine'
     )
     
     code = fields.Char(
         string='Code',
+        index='trigram',
         help='Internal code for the machine'
     )
     
@@ -116,6 +119,26 @@ class LabelMacchina(models.Model):
         help='Maximum number of tracks the machine can handle'
     )
     
+    changeover_matrix = fields.Json(
+        string='Changeover Matrix',
+        compute='_compute_changeover_matrix',
+        store=True,
+        help='Setup minutes per job transition (cold start, same die and material, die change, material change, both)'
+    )
+    
+    # Capacity Planning
+    daily_capacity_hours = fields.Float(
+        string='Available Hours per Day',
+        default=16.0,
+        help='Production hours available each day for scheduling'
+    )
+    
+    shift_start_hour = fields.Float(
+        string='Shift Start (hour)',
+        default=6.0,
+        help='Hour of the day when the first shift starts'
+    )
+    
     precision_rating = fields.Selection([
         ('low', 'Low (±0.5mm)'),
         ('standard', 'Standard (±0.2mm)'),
@@ -152,14 +175,16 @@ class LabelMacchina(models.Model):
         string='Hourly Cost (€)',
         help='Cost per hour of machine operation (legacy field)',
         compute='_compute_hourly_cost',
-        store=True
+        store=True,
+        index=True
     )
     
     setup_cost = fields.Float(
         string='Setup Cost (€)',
         help='Cost for machine setup (legacy field)',
         compute='_compute_setup_cost',
-        store=True
+        store=True,
+        index=True
     )
     
     manufacturer = fields.Char(
@@ -240,10 +265,78 @@ class LabelMacchina(models.Model):
     @api.depends()
     def _compute_quotation_count(self):
         """Compute the number of quotations using this machine"""
+        counts = dict(self.env['label.quotation']._read_group(
+            [('macchina_id', 'in', self.ids)], ['macchina_id'], ['__count']
+        ))
+        for record in self:
+            record.quotation_count = counts.get(record, 0)
+    
+    @api.depends('setup_time', 'die_change_time', 'material_change_time', 'warm_up_time')
+    def _compute_changeover_matrix(self):
+        """Precompute setup minutes for every kind of job transition"""
         for record in self:
-            record.quotation_count = self.env['label.quotation'].search_count([
-                ('macchina_id', '=', record.id)
-            ])
+            setup = record.setup_time or 30  # Same default as the cost model
+            die_change = record.die_change_time or 0
+            material_change = record.material_change_time or 0
+            record.changeover_matrix = {
+                'cold': setup + (record.warm_up_time or 0) + die_change + material_change,
+                'same': setup,
+                'die_change': setup + die_change,
+                'material_change': setup + material_change,
+                'full_change': setup + die_change + material_change,
+            }
+    
+    def _get_changeover_function(self):
+        """Return a fast ``cost(previous, following)`` closure over the matrix
+
+        Jobs are identified by a ``(carta_id, fustella_id)`` key; ``previous``
+        is ``None`` for the first job of a cold machine and ``following`` is
+        ``None`` past the end of the queue (no cost).
+        """
+        self.ensure_one()
+        matrix = self.changeover_matrix or {}
+        cold = matrix.get('cold', 0)
+        transitions = {
+            (True, True): matrix.get('same', 0),
+            (True, False): matrix.get('die_change', 0),
+            (False, True): matrix.get('material_change', 0),
+            (False, False): matrix.get('full_change', 0),
+        }
+        
+        def cost(previous, following):
+            if following is None:
+                return 0
+            if previous is None:
+                return cold
+            return transitions[(previous[0] == following[0], previous[1] == following[1])]
+        
+        return cost
+    
+    def _changeover_minutes(self, previous, following):
+        """Setup minutes needed to run ``following`` right after ``previous``"""
+        return self._get_changeover_function()(previous, following)
+    
+    def _marginal_setup_minutes(self, key, queue):
+        """Extra setup minutes caused by inserting a job into a machine queue
+
+        Evaluates every queue position in one pass over the precomputed
+        matrix and returns ``(minutes, position)`` for the cheapest one. An
+        empty queue charges a full die and material change, as for a job
+        priced without any production plan.
+        """
+        self.ensure_one()
+        if not queue:
+            return (self.changeover_matrix or {}).get('full_change', 0), 0
+        
+        cost = self._get_changeover_function()
+        best_minutes, best_position = None, len(queue)
+        for position in range(len(queue) + 1):
+            before = queue[position - 1] if position else None
+            after = queue[position] if position < len(queue) else None
+            minutes = cost(before, key) + cost(key, after) - cost(before, after)
+            if best_minutes is None or minutes < best_minutes:
+                best_minutes, best_position = minutes, position
+        return best_minutes, best_position
     
     def action_view_quotations(self):
         """Action to view quotations using this machine"""
@@ -315,6 +315,7 @@ class ProductTemplate(models.Model):
     @api.depends('expected_lifetime_cuts', 'cost_per_use')
     def _compute_depreciation_per_use(self):
         """Compute depreciation cost per use"""
+        self._drop_label_snapshots()
         for record in self:
             if record.expected_lifetime_cuts > 0:
                 # Assume initial cost is 100 times the cost per use (rough estimation)
@@ -326,6 +327,8 @@ class ProductTemplate(models.Model):
     depreciation_per_use = fields.Float(
         string='Depreciation per Use (€)',
         compute='_compute_depreciation_per_use',
+        store=True,
+        index=True,
         help='Depreciation cost per use based on lifetime'
     )
     
@@ -333,6 +336,7 @@ class ProductTemplate(models.Model):
     @api.depends('production_cost_per_hour', 'energy_cost_per_hour', 'operator_cost_per_hour', 'overhead_percentage')
     def _compute_hourly_cost(self):
         """Compute total hourly cost including overhead"""
+        self._drop_label_snapshots()
         for record in self:
             base_cost = (record.production_cost_per_hour or 0) + (record.energy_cost_per_hour or 0) + (record.operator_cost_per_hour or 0)
             overhead = base_cost * (record.overhead_percentage or 0) / 100
@@ -341,12 +345,15 @@ class ProductTemplate(models.Model):
     hourly_cost = fields.Float(
         string='Hourly Cost (€)',
         compute='_compute_hourly_cost',
+        store=True,
+        index=True,
         help='Total hourly cost including overhead'
     )
     
     @api.depends('setup_cost_per_hour', 'setup_time')
     def _compute_setup_cost(self):
         """Compute total setup cost based on time and hourly rate"""
+        self._drop_label_snapshots()
         for record in self:
             if record.setup_time and record.setup_cost_per_hour:
                 record.setup_cost = (record.setup_time / 60) * record.setup_cost_per_hour
@@ -356,6 +363,8 @@ class ProductTemplate(models.Model):
     setup_cost = fields.Float(
         string='Setup Cost (€)',
         compute='_compute_setup_cost',
+        store=True,
+        index=True,
         help='Total setup cost based on time and hourly rate'
     )
     
@@ -382,7 +391,54 @@ class ProductTemplate(models.Model):
             if record.efficiency_factor < 0 or record.efficiency_factor > 1:
                 raise ValidationError(_('Efficiency factor must be between 0 and 1.'))
     
+    def write(self, vals):
+        """Drop the label snapshots of the written products"""
+        self._drop_label_snapshots()
+        return super().write(vals)
+    
+    def _drop_label_snapshots(self):
+        """Forget the label snapshots of the products, rebuilt on next read"""
+        snapshots = self.env.cr.cache.get('label_quotation.product_snapshots')
+        if not snapshots:
+            return
+        product_ids = set(self.ids)
+        for key in [key for key in snapshots if key[1] in product_ids]:
+            del snapshots[key]
+    
+    def _label_snapshots(self):
+        """Snapshot store of the current transaction, emptied when it ends"""
+        cr = self.env.cr
+        snapshots = cr.cache.get('label_quotation.product_snapshots')
+        if snapshots is None:
+            snapshots = cr.cache['label_quotation.product_snapshots'] = {}
+
+            def drop():
+                cr.cache.pop('label_quotation.product_snapshots', None)
+
+            cr.postcommit.add(drop)
+            cr.postrollback.add(drop)
+        return snapshots
+    
     # Methods for compatibility with existing models
+    def _get_label_snapshot(self, kind):
+        """Material/machine/die data of this product
+
+        The data is built once per product, language and transaction, so every
+        compute of every quotation reuses it until the product is written or
+        recomputed. Each caller gets its own copy, safe to store in a Json field.
+        """
+        self.ensure_one()
+        key = (kind, self.id, self.env.lang)
+        snapshots = self._label_snapshots()
+        if key not in snapshots:
+            builders = {
+                'material': self.get_material_data,
+                'machine': self.get_machine_data,
+                'die': self.get_die_data,
+            }
+            snapshots[key] = builders[kind]()
+        return dict(snapshots[key])
+    
     def get_material_data(self):
         """Get material data for compatibility with label.carta model"""
         if not self.is_label_material:
@@ -462,5 +518,6 @@ class ProductTemplate(models.Model):
             'expected_lifetime_cuts': self.expected_lifetime_cuts,
             'current_usage_count': self.current_usage_count,
             'cost_per_use': self.cost_per_use,
+            'depreciation_per_use': self.depreciation_per_use,
             'setup_time': self.setup_time_die,
         }
@@ -2,8 +2,21 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index, index_exists
 from datetime import datetime, timedelta
 
+from ..tools import timed, timed_block
+
+# Composite indexes serving the analysis report filters (date range per
+# state, machine or material) and the master data smart buttons
+ANALYSIS_INDEXES = {
+    'state_date': ['state', 'date'],
+    'macchina_date': ['macchina_id', 'date'],
+    'carta_date': ['carta_id', 'date'],
+    'fustella_date': ['fustella_id', 'date'],
+}
+
 
 class LabelQuotation(models.Model):
     _name = 'label.quotation'
@@ -38,6 +51,7 @@ class LabelQuotation(models.Model):
     valid_until = fields.Date(
         string='Valid Until',
         required=True,
+        index=True,
         tracking=True
     )
     
@@ -47,6 +61,7 @@ class LabelQuotation(models.Model):
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
         ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
     ], string='Status', default='draft', tracking=True)
     
     company_id = fields.Many2one(
@@ -217,7 +232,31 @@ class LabelQuotation(models.Model):
         help='Additional notes for the quotation'
     )
     
+    def init(self):
+        """Create the analysis indexes on a fresh table
+        
+        Databases that already hold quotations get them from the 19.0.1.1.0
+        migration, built concurrently so the upgrade never locks the table.
+        """
+        super().init()
+        cr = self.env.cr
+        cr.execute(SQL("SELECT 1 FROM %s LIMIT 1", SQL.identifier(self._table)))
+        if cr.rowcount:
+            return
+        for indexname, columns in self._get_analysis_indexes().items():
+            if not index_exists(cr, indexname):
+                create_index(cr, indexname, self._table, columns)
+    
+    @api.model
+    def _get_analysis_indexes(self):
+        """Analysis index names and columns for this model's table"""
+        return {
+            f'{self._table}_{suffix}_index': columns
+            for suffix, columns in ANALYSIS_INDEXES.items()
+        }
+    
     @api.depends('label_width', 'label_height', 'interspace', 'tracks', 'total_quantity', 'carta_id', 'fustella_id', 'macchina_id')
+    @timed()
     def _compute_dimensions(self):
         """Compute label dimensions and material requirements with advanced production calculations"""
         for record in self:
@@ -246,10 +285,6 @@ class LabelQuotation(models.Model):
         """Calculate optimal production parameters considering all constraints"""
         self.ensure_one()
         
-        # Get configuration values
-        config = self.env['label.config'].search([], limit=1)
-        min_yield = config.min_yield_percentage if config else 80.0
-        
         # Basic calculations
         edge_margin = 5.0  # 5mm edge margin on each side
         
@@ -338,8 +373,10 @@ class LabelQuotation(models.Model):
         return max(0, min(100, base_yield))
     
     @api.depends('total_area_sqm', 'carta_id', 'fustella_id', 'macchina_id', 'linear_length', 'yield_percentage')
+    @timed()
     def _compute_costs(self):
         """Compute material and production costs with advanced calculations"""
+        queues = self.env['label.production.slot']._get_machine_queues(self.macchina_id)
         for record in self:
             # Enhanced paper cost calculation with waste
             if record.carta_id and record.total_area_sqm:
@@ -385,12 +422,8 @@ class LabelQuotation(models.Model):
                 
                 production_time_hours = record.linear_length / (effective_speed * 60)
                 
-                # Setup time
-                setup_time_hours = (record.macchina_id.setup_time or 30) / 60  # Convert minutes to hours
-                if hasattr(record.macchina_id, 'die_change_time'):
-                    setup_time_hours += (record.macchina_id.die_change_time or 0) / 60
-                if hasattr(record.macchina_id, 'material_change_time'):
-                    setup_time_hours += (record.macchina_id.material_change_time or 0) / 60
+                # Setup time, depending on the job before it on the machine
+                setup_time_hours = record._get_setup_minutes(queues) / 60  # Convert minutes to hours
                 
                 total_time_hours = production_time_hours + setup_time_hours
                 
@@ -422,7 +455,25 @@ class LabelQuotation(models.Model):
             else:
                 record.cost_per_sqm = 0
     
+    def _get_setup_minutes(self, queues):
+        """Setup minutes charged to this quotation given the machine queues
+
+        A planned job pays the changeover it has in the plan; any other job
+        pays the cheapest marginal changeover over every queue position, so
+        running after a job on the same die and material skips most of it.
+        """
+        self.ensure_one()
+        queue = queues.get(self.macchina_id.id)
+        if not queue or not queue['keys']:
+            return (self.macchina_id.changeover_matrix or {}).get('full_change', 0)
+        # In-memory variants are looked up through the quotation they come from
+        if self._origin.id in queue['planned']:
+            return queue['planned'][self._origin.id]
+        key = (self.carta_id.id, self.fustella_id.id)
+        return self.macchina_id._marginal_setup_minutes(key, queue['keys'])[0]
+    
     @api.depends('total_cost', 'margin_percentage')
+    @timed()
     def _compute_selling_price(self):
         """Compute selling price with margin"""
         for record in self:
@@ -437,18 +488,57 @@ class LabelQuotation(models.Model):
                 record.price_per_label = 0
     
     @api.model_create_multi
+    @timed()
     def create(self, vals_list):
         """Generate quotation number on creation"""
+        config = None
         for vals in vals_list:
             if vals.get('name', _('New')) == _('New'):
-                vals['name'] = self.env['ir.sequence'].next_by_code('label.quotation') or _('New')
+                with timed_block('LabelQuotation.sequence'):
+                    # Number from the quotation's company sequence, dated as the quotation
+                    company = self.env['res.company'].browse(vals.get('company_id')) or self.env.company
+                    vals['name'] = self.env['ir.sequence'].with_company(company).next_by_code(
+                        'label.quotation', sequence_date=vals.get('date')) or _('New')
             
             # Set default validity date
             if not vals.get('valid_until'):
-                config = self.env['label.config'].get_config()
+                config = config or self.env['label.config'].get_config()
                 vals['valid_until'] = fields.Date.today() + timedelta(days=config.default_quotation_validity_days)
         
-        return super().create(vals_list)
+        quotations = super().create(vals_list)
+        # Quotations created accepted join the plan like the ones accepted later
+        accepted = quotations.filtered(lambda q: q.state == 'accepted')
+        if accepted and 'state' in self._get_schedule_fields():
+            self.env['label.production.slot']._replan_quotations(accepted)
+            self.env['label.fustella.usage']._sync_quotations(accepted)
+        return quotations
+    
+    @timed()
+    def write(self, vals):
+        """Keep the production plan and die usage ledger in step with accepted quotations"""
+        res = super().write(vals)
+        if self._get_schedule_fields() & set(vals):
+            self.env['label.production.slot']._replan_quotations(self)
+            self.env['label.fustella.usage']._sync_quotations(self)
+        if self._get_sale_line_fields() & set(vals):
+            self.env['sale.order.line']._propagate_label_values(quotation_ids=self.ids)
+        return res
+    
+    @timed()
+    def _track_finalize(self):
+        """Mail tracking of the changed quotations"""
+        return super()._track_finalize()
+    
+    def _get_schedule_fields(self):
+        """Fields whose change moves a quotation in the production plan"""
+        return {
+            'state', 'macchina_id', 'carta_id', 'fustella_id',
+            'label_height', 'interspace', 'tracks', 'total_quantity',
+        }
+    
+    def _get_sale_line_fields(self):
+        """Fields copied onto the sale order lines of the quotation"""
+        return {'label_width', 'label_height', 'carta_id'}
     
     def action_send_quotation(self):
         """Send quotation to customer"""
@@ -468,12 +558,44 @@ class LabelQuotation(models.Model):
         """Cancel quotation"""
         self.write({'state': 'cancelled'})
     
+    @api.model
+    def _cron_expire_quotations(self):
+        """Move sent quotations past their validity date to expired
+        
+        One UPDATE per company on the indexed ``valid_until``, so the job
+        only touches expired rows; the chatter notes are posted in one batch.
+        """
+        self.flush_model(['state', 'valid_until', 'company_id'])
+        today = fields.Date.context_today(self)
+        expired_ids = []
+        for company in self.env['res.company'].search([]):
+            self.env.cr.execute(SQL(
+                """UPDATE label_quotation
+                      SET state = 'expired', write_uid = %s, write_date = NOW() AT TIME ZONE 'UTC'
+                    WHERE company_id = %s AND state = 'sent' AND valid_until < %s
+                RETURNING id""",
+                self.env.uid, company.id, today,
+            ))
+            expired_ids += [quotation_id for quotation_id, in self.env.cr.fetchall()]
+        
+        if not expired_ids:
+            return
+        self.invalidate_model(['state', 'write_uid', 'write_date'])
+        quotations = self.browse(expired_ids)
+        quotations._message_log_batch(
+            bodies={
+                quotation.id: _('Quotation expired: valid until %s.') % quotation.valid_until
+                for quotation in quotations
+            },
+        )
+    
     def action_generate_pdf(self):
         """Generate PDF quotation"""
         return self.env['label.quotation.report'].action_generate_pdf(self.id)
     
     # Validation constraints
     @api.constrains('label_width', 'label_height', 'carta_id', 'macchina_id')
+    @timed()
     def _check_material_machine_compatibility(self):
         """Validate that label dimensions are compatible with material and machine"""
         for record in self:
@@ -497,6 +619,7 @@ class LabelQuotation(models.Model):
                     ).format(record.web_width, record.macchina_id.max_web_width, record.macchina_id.name))
     
     @api.constrains('tracks', 'macchina_id', 'fustella_id')
+    @timed()
     def _check_tracks_compatibility(self):
         """Validate track count against machine and die capabilities"""
         for record in self:
@@ -516,13 +639,13 @@ class LabelQuotation(models.Model):
                         ).format(record.tracks, record.fustella_id.max_tracks, record.fustella_id.name))
     
     @api.constrains('yield_percentage')
+    @timed()
     def _check_yield_percentage(self):
         """Validate yield percentage is within acceptable range"""
+        config = self.env['label.config'].search([], limit=1)
+        min_yield = config.min_yield_percentage if config else 80.0
         for record in self:
             if record.yield_percentage is not False:  # Allow 0% yield for error indication
-                config = self.env['label.config'].search([], limit=1)
-                min_yield = config.min_yield_percentage if config else 80.0
-                
                 if record.yield_percentage < min_yield:
                     raise ValidationError(_(
                         'Material yield ({}%) is below minimum acceptable yield ({}%). '
@@ -530,6 +653,7 @@ class LabelQuotation(models.Model):
                     ).format(record.yield_percentage, min_yield))
     
     @api.constrains('total_quantity')
+    @timed()
     def _check_minimum_order_quantity(self):
         """Check if quantity meets material minimum requirements"""
         for record in self:
@@ -541,6 +665,7 @@ class LabelQuotation(models.Model):
                         ).format(record.linear_length, record.carta_id.minimum_order_quantity, record.carta_id.name))
     
     @api.constrains('carta_id', 'fustella_id')
+    @timed()
     def _check_material_die_compatibility(self):
         """Check if material is compatible with selected die"""
         for record in self:
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Closed quotations nothing will change anymore
+ARCHIVE_STATES = ['accepted', 'rejected', 'cancelled', 'expired']
+
+# Columns copied from label_quotation, all of them existing on both tables
+ARCHIVE_FIELDS = [
+    'name', 'partner_id', 'company_id', 'date', 'state',
+    'carta_id', 'fustella_id', 'macchina_id',
+    'label_width', 'label_height', 'tracks', 'total_quantity',
+    'linear_length', 'total_area_sqm', 'yield_percentage',
+    'paper_cost', 'die_cost', 'machine_cost', 'total_cost', 'selling_price',
+]
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+class LabelQuotationArchive(models.Model):
+    """Cold storage of closed quotations
+
+    Closed quotations past the company's archive horizon are moved here with
+    only the figures the analysis reports read, no tracking, followers or
+    log columns, so the quotation table only holds the live working set.
+    Field names match label.quotation so reports can read both alike.
+    """
+    _name = 'label.quotation.archive'
+    _description = 'Archived Label Quotation'
+    _rec_name = 'name'
+    _order = 'date desc, id desc'
+    _log_access = False
+
+    original_id = fields.Integer(
+        string='Original ID',
+        readonly=True,
+        index=True
+    )
+
+    name = fields.Char(
+        string='Quotation Number',
+        readonly=True
+    )
+
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Customer',
+        readonly=True,
+        index=True
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Company',
+        readonly=True,
+        index=True
+    )
+
+    date = fields.Date(
+        string='Date',
+        readonly=True,
+        index=True
+    )
+
+    state = fields.Selection([
+        ('accepted', 'Accepted'),
+        ('rejected', 'Rejected'),
+        ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
+    ], string='Status', readonly=True)
+
+    carta_id = fields.Many2one(
+        'label.carta',
+        string='Paper Material',
+        readonly=True
+    )
+
+    fustella_id = fields.Many2one(
+        'label.fustella',
+        string='Die',
+        readonly=True
+    )
+
+    macchina_id = fields.Many2one(
+        'label.macchina',
+        string='Machine',
+        readonly=True
+    )
+
+    label_width = fields.Float(string='Label Width (mm)', readonly=True)
+    label_height = fields.Float(string='Label Height (mm)', readonly=True)
+    tracks = fields.Integer(string='Number of Tracks', readonly=True)
+    total_quantity = fields.Integer(string='Total Quantity', readonly=True)
+    linear_length = fields.Float(string='Linear Length (m)', readonly=True)
+    total_area_sqm = fields.Float(string='Total Area (m²)', readonly=True)
+    yield_percentage = fields.Float(string='Yield (%)', readonly=True)
+    paper_cost = fields.Float(string='Paper Cost (€)', readonly=True)
+    die_cost = fields.Float(string='Die Cost (€)', readonly=True)
+    machine_cost = fields.Float(string='Machine Cost (€)', readonly=True)
+    total_cost = fields.Float(string='Total Cost (€)', readonly=True)
+    selling_price = fields.Float(string='Selling Price (€)', readonly=True)
+
+    @api.model
+    def _get_archived_until(self):
+        """Date of the most recent archived quotation, False when none is"""
+        return self.search([], order='date desc', limit=1).date
+
+    @api.model
+    def _cron_archive_quotations(self, limit=50000):
+        """Archive the closed quotations past each company's horizon"""
+        today = fields.Date.context_today(self)
+        for config in self.env['label.config'].search([('archive_horizon_days', '>', 0)]):
+            before = today - timedelta(days=config.archive_horizon_days)
+            limit -= self._archive_quotations(config.company_id, before, limit)
+            if limit <= 0:
+                break
+
+    @api.model
+    def _archive_quotations(self, company, before, limit=None):
+        """Move closed quotations dated before ``before`` to the archive
+
+        Quotations still referenced by sale orders stay in place; die usage
+        entries keep the quotation number and date and only lose the link.
+        Rows are copied with one INSERT ... SELECT per batch, then unlinked
+        through the ORM so their messages, followers and revisions go with them.
+
+        :return: number of archived quotations
+        """
+        Quotation = self.env['label.quotation']
+        Quotation.flush_model()
+        cr = self.env.cr
+        columns = SQL(', ').join(SQL.identifier(fname) for fname in ARCHIVE_FIELDS)
+        archived = 0
+        while limit is None or archived < limit:
+            batch_size = ARCHIVE_BATCH_SIZE if limit is None else min(ARCHIVE_BATCH_SIZE, limit - archived)
+            cr.execute(SQL(
+                """SELECT quotation.id
+                     FROM label_quotation AS quotation
+                    WHERE quotation.company_id = %(company)s
+                      AND quotation.state IN %(states)s
+                      AND quotation.date < %(before)s
+                      AND quotation.sale_order_id IS NULL
+                      AND NOT EXISTS (SELECT 1 FROM sale_order WHERE label_quotation_id = quotation.id)
+                      AND NOT EXISTS (SELECT 1 FROM sale_order_line WHERE label_quotation_id = quotation.id)
+                 ORDER BY quotation.id
+                    LIMIT %(limit)s""",
+                company=company.id,
+                states=tuple(ARCHIVE_STATES),
+                before=before,
+                limit=batch_size,
+            ))
+            ids = [quotation_id for quotation_id, in cr.fetchall()]
+            if not ids:
+                break
+
+            cr.execute(SQL(
+                """INSERT INTO label_quotation_archive (original_id, %(columns)s)
+                   SELECT id, %(columns)s FROM label_quotation WHERE id IN %(ids)s""",
+                columns=columns,
+                ids=tuple(ids),
+            ))
+            Quotation.browse(ids).unlink()
+            archived += len(ids)
+
+        if archived:
+            self.invalidate_model()
+            _logger.info("Archived %s quotations of %s dated before %s", archived, company.name, before)
+        return archived
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api, _
+from odoo import models, fields, api, _, Command
 from odoo.exceptions import ValidationError
 
+from ..tools import timed
+
 
 class LabelQuotationProduct(models.Model):
     _name = 'label.quotation.product'
@@ -33,11 +35,12 @@ class LabelQuotationProduct(models.Model):
     
     # Computed fields for compatibility
     @api.depends('material_product_id')
+    @timed()
     def _compute_material_data(self):
         """Compute material data from product"""
         for record in self:
             if record.material_product_id and record.material_product_id.is_label_material:
-                record.material_data = record.material_product_id.get_material_data()
+                record.material_data = record.material_product_id._get_label_snapshot('material')
             else:
                 record.material_data = {}
     
@@ -48,11 +51,12 @@ class LabelQuotationProduct(models.Model):
     )
     
     @api.depends('machine_product_id')
+    @timed()
     def _compute_machine_data(self):
         """Compute machine data from product"""
         for record in self:
             if record.machine_product_id and record.machine_product_id.is_label_machine:
-                record.machine_data = record.machine_product_id.get_machine_data()
+                record.machine_data = record.machine_product_id._get_label_snapshot('machine')
             else:
                 record.machine_data = {}
     
@@ -63,11 +67,12 @@ class LabelQuotationProduct(models.Model):
     )
     
     @api.depends('die_product_id')
+    @timed()
     def _compute_die_data(self):
         """Compute die data from product"""
         for record in self:
             if record.die_product_id and record.die_product_id.is_label_die:
-                record.die_data = record.die_product_id.get_die_data()
+                record.die_data = record.die_product_id._get_label_snapshot('die')
             else:
                 record.die_data = {}
     
@@ -79,11 +84,12 @@ class LabelQuotationProduct(models.Model):
     
     # Override methods to use product data
     @api.depends('material_product_id', 'label_width', 'label_height', 'tracks', 'interspace')
+    @timed()
     def _compute_web_width(self):
         """Compute web width using product data"""
         for record in self:
             if record.material_product_id and record.material_product_id.is_label_material:
-                material_data = record.material_product_id.get_material_data()
+                material_data = record.material_product_id._get_label_snapshot('material')
                 max_width = material_data.get('max_width', 0)
                 
                 if record.tracks and record.label_width and record.interspace:
@@ -95,11 +101,12 @@ class LabelQuotationProduct(models.Model):
                 record.web_width = 0
     
     @api.depends('machine_product_id', 'web_width', 'total_quantity')
+    @timed()
     def _compute_production_time(self):
         """Compute production time using product data"""
         for record in self:
             if record.machine_product_id and record.machine_product_id.is_label_machine:
-                machine_data = record.machine_product_id.get_machine_data()
+                machine_data = record.machine_product_id._get_label_snapshot('machine')
                 max_speed = machine_data.get('max_speed', 0)
                 efficiency = machine_data.get('efficiency_factor', 1.0)
                 
@@ -115,11 +122,12 @@ class LabelQuotationProduct(models.Model):
                 record.production_time = 0
     
     @api.depends('material_product_id', 'web_width', 'production_time')
+    @timed()
     def _compute_material_cost(self):
         """Compute material cost using product data"""
         for record in self:
             if record.material_product_id and record.material_product_id.is_label_material:
-                material_data = record.material_product_id.get_material_data()
+                material_data = record.material_product_id._get_label_snapshot('material')
                 cost_per_sqm = material_data.get('cost_per_sqm', 0)
                 waste_factor = material_data.get('waste_factor', 0)
                 
@@ -138,11 +146,12 @@ class LabelQuotationProduct(models.Model):
                 record.material_cost = 0
     
     @api.depends('machine_product_id', 'production_time')
+    @timed()
     def _compute_machine_cost(self):
         """Compute machine cost using product data"""
         for record in self:
             if record.machine_product_id and record.machine_product_id.is_label_machine:
-                machine_data = record.machine_product_id.get_machine_data()
+                machine_data = record.machine_product_id._get_label_snapshot('machine')
                 production_cost_per_hour = machine_data.get('production_cost_per_hour', 0)
                 setup_cost_per_hour = machine_data.get('setup_cost_per_hour', 0)
                 setup_time = machine_data.get('setup_time', 0)
@@ -158,11 +167,12 @@ class LabelQuotationProduct(models.Model):
                 record.machine_cost = 0
     
     @api.depends('die_product_id', 'total_quantity')
+    @timed()
     def _compute_die_cost(self):
         """Compute die cost using product data"""
         for record in self:
             if record.die_product_id and record.die_product_id.is_label_die:
-                die_data = record.die_product_id.get_die_data()
+                die_data = record.die_product_id._get_label_snapshot('die')
                 cost_per_use = die_data.get('cost_per_use', 0)
                 depreciation_per_use = die_data.get('depreciation_per_use', 0)
                 
@@ -177,6 +187,7 @@ class LabelQuotationProduct(models.Model):
     
     # Override total cost calculation
     @api.depends('material_cost', 'machine_cost', 'die_cost', 'labor_cost', 'overhead_cost')
+    @timed()
     def _compute_total_cost(self):
         """Compute total cost using product-based calculations"""
         for record in self:
@@ -188,56 +199,81 @@ class LabelQuotationProduct(models.Model):
                 record.overhead_cost
             )
     
+    def _get_schedule_fields(self):
+        """Product-based quotations are not planned on label.macchina"""
+        return set()
+    
+    def _get_sale_line_fields(self):
+        """Sale order lines only reference classic label quotations"""
+        return set()
+    
+    def _get_setup_minutes(self, queues):
+        """Product-based quotations are not in the plan: charge a full changeover"""
+        self.ensure_one()
+        return (self.macchina_id.changeover_matrix or {}).get('full_change', 0)
+    
     # Methods for product integration
+    @timed()
     def action_create_sale_order(self):
-        """Create sale order with products"""
-        self.ensure_one()
-        
-        if not self.material_product_id or not self.machine_product_id or not self.die_product_id:
-            raise ValidationError(_('Please select material, machine, and die products before creating sale order.'))
-        
-        # Create sale order
-        sale_order = self.env['sale.order'].create({
-            'partner_id': self.partner_id.id,
-            'date_order': fields.Date.context_today(self),
-            'company_id': self.company_id.id,
-        })
-        
-        # Add material product line
-        self.env['sale.order.line'].create({
-            'order_id': sale_order.id,
-            'product_id': self.material_product_id.id,
-            'product_uom_qty': self.total_quantity,
-            'price_unit': self.material_product_id.list_price,
-        })
+        """Create sale orders with products for all selected quotations
         
-        # Add machine service line
-        self.env['sale.order.line'].create({
-            'order_id': sale_order.id,
-            'product_id': self.machine_product_id.id,
-            'product_uom_qty': self.production_time / 60,  # Convert to hours
-            'price_unit': self.machine_product_id.list_price,
-        })
+        Every quotation becomes one sale order; orders and their lines are
+        created in a single batch so totals and taxes are computed once.
+        """
+        missing = self.filtered(lambda q: not q.material_product_id or not q.machine_product_id or not q.die_product_id)
+        if missing:
+            raise ValidationError(_('Please select material, machine, and die products before creating sale order.\n'
+                                    'Incomplete quotations: %s', ', '.join(missing.mapped('name'))))
         
-        # Add die service line
-        self.env['sale.order.line'].create({
-            'order_id': sale_order.id,
-            'product_id': self.die_product_id.id,
-            'product_uom_qty': 1,  # One die setup
-            'price_unit': self.die_product_id.list_price,
-        })
+        sale_orders = self.env['sale.order'].create([quotation._prepare_sale_order_vals() for quotation in self])
         
         # Update quotation state
-        self.state = 'accepted'
+        self.write({'state': 'accepted'})
         
-        return {
+        action = {
             'type': 'ir.actions.act_window',
             'name': _('Sale Order'),
             'res_model': 'sale.order',
-            'res_id': sale_order.id,
-            'view_mode': 'form',
             'target': 'current',
         }
+        if len(sale_orders) == 1:
+            action.update({'res_id': sale_orders.id, 'view_mode': 'form'})
+        else:
+            action.update({
+                'name': _('Sale Orders'),
+                'domain': [('id', 'in', sale_orders.ids)],
+                'view_mode': 'list,form',
+            })
+        return action
+    
+    def _prepare_sale_order_vals(self):
+        """Sale order values with material, machine and die lines as commands"""
+        self.ensure_one()
+        return {
+            'partner_id': self.partner_id.id,
+            'date_order': fields.Date.context_today(self),
+            'company_id': self.company_id.id,
+            'order_line': [
+                # Material product line
+                Command.create({
+                    'product_id': self.material_product_id.id,
+                    'product_uom_qty': self.total_quantity,
+                    'price_unit': self.material_product_id.list_price,
+                }),
+                # Machine service line
+                Command.create({
+                    'product_id': self.machine_product_id.id,
+                    'product_uom_qty': self.production_time / 60,  # Convert to hours
+                    'price_unit': self.machine_product_id.list_price,
+                }),
+                # Die service line
+                Command.create({
+                    'product_id': self.die_product_id.id,
+                    'product_uom_qty': 1,  # One die setup
+                    'price_unit': self.die_product_id.list_price,
+                }),
+            ],
+        }
     
     def action_generate_pdf(self):
         """Generate PDF quotation with product details"""
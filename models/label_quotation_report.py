@@ -11,11 +11,14 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+from ..tools import timed
+
 
 class LabelQuotationReport(models.Model):
     _name = 'label.quotation.report'
     _description = 'Label Quotation Report Generator'
 
+    @timed()
     def generate_quotation_pdf(self, quotation_id):
         """Generate PDF report for label quotation"""
         quotation = self.env['label.quotation'].browse(quotation_id)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from ..tools import timed
+
+_logger = logging.getLogger(__name__)
+
+# Largest quotations x trials matrix sampled at once, bounding memory to a
+# few tens of MB per array whatever the backlog size
+MAX_SAMPLES = 2000000
+
+RISK_FIELDS = ['cost_p10', 'cost_p50', 'cost_p90', 'margin_p10', 'margin_p50', 'margin_p90']
+
+
+class LabelQuotation(models.Model):
+    _inherit = 'label.quotation'
+
+    # Cost Risk
+    cost_p10 = fields.Float(
+        string='Cost P10 (€)',
+        readonly=True,
+        copy=False,
+        help='Cost not exceeded in 10% of the simulated productions'
+    )
+
+    cost_p50 = fields.Float(
+        string='Cost P50 (€)',
+        readonly=True,
+        copy=False,
+        help='Median simulated cost'
+    )
+
+    cost_p90 = fields.Float(
+        string='Cost P90 (€)',
+        readonly=True,
+        copy=False,
+        help='Cost not exceeded in 90% of the simulated productions'
+    )
+
+    margin_p10 = fields.Float(
+        string='Margin P10 (€)',
+        readonly=True,
+        copy=False,
+        help='Margin at the quoted price reached in 90% of the simulated productions'
+    )
+
+    margin_p50 = fields.Float(
+        string='Margin P50 (€)',
+        readonly=True,
+        copy=False,
+        help='Median simulated margin at the quoted price'
+    )
+
+    margin_p90 = fields.Float(
+        string='Margin P90 (€)',
+        readonly=True,
+        copy=False,
+        help='Margin at the quoted price reached in 10% of the simulated productions'
+    )
+
+    risk_date = fields.Datetime(
+        string='Risk Analysis Date',
+        readonly=True,
+        copy=False
+    )
+
+    def action_risk_analysis(self):
+        """Run the cost risk analysis on the selected quotations"""
+        self._compute_cost_risk()
+        return True
+
+    @api.model
+    def action_backlog_risk_analysis(self):
+        """Run the cost risk analysis on every open quotation"""
+        quotations = self.search([('state', 'in', ['draft', 'sent'])])
+        quotations._compute_cost_risk()
+        return len(quotations)
+
+    @timed()
+    def _compute_cost_risk(self, seed=None):
+        """Monte Carlo cost and margin percentiles of the quotations
+
+        Yield, machine efficiency and setup time are sampled from the
+        distributions configured per company; every other input keeps its
+        quoted value. Trials run vectorised over blocks of quotations and the
+        percentiles are stored with a single UPDATE per block.
+        """
+        if np is None:
+            raise UserError(_('The risk analysis requires the numpy Python library.'))
+        if not self:
+            return
+
+        self.flush_model()
+        rng = np.random.default_rng(seed)
+        started = time.monotonic()
+        for company, quotations in self.grouped('company_id').items():
+            config = self.env['label.config'].get_config(company.id)
+            trials = config.risk_trial_count
+            block_size = max(1, MAX_SAMPLES // trials)
+            for start in range(0, len(quotations), block_size):
+                block = quotations[start:start + block_size]
+                self._store_cost_risk(self._simulate_cost_risk(block, config, rng))
+
+        self.invalidate_model(RISK_FIELDS + ['risk_date'])
+        _logger.info("Risk analysis of %s quotations in %.1fs", len(self), time.monotonic() - started)
+
+    @api.model
+    def _simulate_cost_risk(self, quotations, config, rng):
+        """Percentile rows ``(id, cost P10/P50/P90, margin P10/P50/P90)``"""
+        engine = self.env['label.price.simulation.wizard']
+        backlog = engine._load_backlog([('id', 'in', quotations.ids)], self._name)
+        params = engine._load_master_params(backlog)
+        trials = config.risk_trial_count
+        size = (len(backlog['ids']), trials)
+
+        carta = backlog['carta']
+        macchina = backlog['macchina']
+        has_carta = (carta < len(backlog['carta_ids']))[:, None]
+        running = (macchina < len(backlog['macchina_ids'])) & (backlog['linear_length'] > 0)
+
+        # Paper: sampled yield around the heuristic one
+        yield_percentage = np.clip(self._sample_risk(
+            rng, config.risk_yield_distribution,
+            backlog['yield_percentage'][:, None], config.risk_yield_spread, size,
+        ), 1.0, 100.0)
+        area = backlog['total_area_sqm'][:, None] * 100.0 / yield_percentage
+        paper_cost = np.where(has_carta, area * params['cost_per_sqm'][carta][:, None], 0.0)
+
+        # Machine: setup hours as quoted, then scaled by the sampled setup and efficiency
+        speed = params['max_speed'][macchina] * params['efficiency_factor'][macchina]
+        production_hours = np.where(running, backlog['linear_length'] / (speed * 60), 0.0)
+        setup_hours = engine._setup_hours(backlog, params, production_hours, running)
+
+        efficiency = params['efficiency_factor'][macchina][:, None]
+        sampled_efficiency = np.clip(self._sample_risk(
+            rng, config.risk_efficiency_distribution,
+            efficiency, efficiency * config.risk_efficiency_spread / 100, size,
+        ), 0.05, 1.0)
+        setup_factor = np.maximum(self._sample_risk(
+            rng, config.risk_setup_distribution, 1.0, config.risk_setup_spread / 100, size,
+        ), 0.0)
+        machine_cost = np.where(
+            running[:, None],
+            engine._machine_cost(
+                params, macchina[:, None],
+                production_hours[:, None] * efficiency / sampled_efficiency,
+                setup_hours[:, None] * setup_factor,
+            ),
+            0.0,
+        )
+
+        cost = paper_cost + backlog['die_cost'][:, None] + machine_cost
+        cost_p10, cost_p50, cost_p90 = np.percentile(cost, [10, 50, 90], axis=1)
+        selling_price = backlog['selling_price']
+        return list(zip(
+            backlog['ids'].tolist(),
+            cost_p10.tolist(), cost_p50.tolist(), cost_p90.tolist(),
+            (selling_price - cost_p90).tolist(),
+            (selling_price - cost_p50).tolist(),
+            (selling_price - cost_p10).tolist(),
+        ))
+
+    @api.model
+    def _sample_risk(self, rng, distribution, center, spread, size):
+        """Draw ``size`` samples around ``center``
+
+        ``spread`` is the standard deviation of a normal distribution and the
+        half-width of a uniform or triangular one.
+        """
+        if not np.any(spread):
+            return np.broadcast_to(np.asarray(center, dtype=float), size)
+        if distribution == 'normal':
+            return rng.normal(center, spread, size)
+        if distribution == 'uniform':
+            return rng.uniform(center - spread, center + spread, size)
+        return rng.triangular(center - spread, center, center + spread, size)
+
+    @api.model
+    def _store_cost_risk(self, rows):
+        """Write the percentile rows in one statement, bypassing the ORM"""
+        if not rows:
+            return
+        self.env.cr.execute(SQL(
+            """
+            UPDATE %(table)s AS quotation
+               SET cost_p10 = risk.cost_p10,
+                   cost_p50 = risk.cost_p50,
+                   cost_p90 = risk.cost_p90,
+                   margin_p10 = risk.margin_p10,
+                   margin_p50 = risk.margin_p50,
+                   margin_p90 = risk.margin_p90,
+                   risk_date = NOW() AT TIME ZONE 'UTC'
+              FROM (VALUES %(rows)s) AS risk(id, cost_p10, cost_p50, cost_p90, margin_p10, margin_p50, margin_p90)
+             WHERE quotation.id = risk.id
+            """,
+            table=SQL.identifier(self._table),
+            rows=SQL(', ').join(SQL('%s', row) for row in rows),
+        ))
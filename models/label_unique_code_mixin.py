@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import index_exists
+
+_logger = logging.getLogger(__name__)
+
+
+class LabelUniqueCodeMixin(models.AbstractModel):
+    """Unique codes among active records, enforced by the database
+
+    A partial unique index guarantees uniqueness even under concurrent
+    imports; create and write pre-check their whole batch in one query so
+    users get every conflicting code at once instead of an integrity error.
+    Empty codes are stored as NULL, which the index leaves out like the
+    pre-check does.
+    """
+    _name = 'label.unique.code.mixin'
+    _description = 'Unique Code'
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        cr = self.env.cr
+        indexname = f'{self._table}_code_active_uniq'
+        if index_exists(cr, indexname):
+            return
+        # Legacy empty codes would collide with each other, store them as NULL
+        cr.execute(SQL("UPDATE %s SET code = NULL WHERE code = ''", SQL.identifier(self._table)))
+        try:
+            with cr.savepoint():
+                cr.execute(SQL(
+                    "CREATE UNIQUE INDEX %s ON %s (code) WHERE active AND code IS NOT NULL",
+                    SQL.identifier(indexname), SQL.identifier(self._table),
+                ))
+        except Exception:
+            cr.execute(SQL(
+                """SELECT code FROM %s
+                    WHERE active AND code IS NOT NULL
+                 GROUP BY code HAVING COUNT(*) > 1""",
+                SQL.identifier(self._table),
+            ))
+            _logger.warning(
+                "Cannot enforce unique codes on %s, duplicated active codes: %s",
+                self._name, ', '.join(code for code, in cr.fetchall()),
+            )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('code') == '':
+                vals['code'] = False
+        self._check_code_conflicts([
+            vals.get('code') for vals in vals_list if vals.get('active', True)
+        ])
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if vals.get('code') == '':
+            vals = dict(vals, code=False)
+        if vals.get('code') or vals.get('active'):
+            if 'active' in vals:
+                activated = self if vals['active'] else self.browse()
+            else:
+                activated = self.filtered('active')
+            if vals.get('code'):
+                codes = [vals['code']] * len(activated)
+            else:
+                # Only records leaving the archive change the set of active codes
+                codes = activated.filtered(lambda record: not record.active).mapped('code')
+            self._check_code_conflicts(codes, exclude_ids=self.ids)
+        return super().write(vals)
+
+    @api.model
+    def _check_code_conflicts(self, codes, exclude_ids=()):
+        """Raise one error listing every code used twice in the batch or already taken
+
+        :param codes: codes about to become active, one per record
+        :param exclude_ids: records being written, which cannot conflict with their old codes
+        """
+        codes = [code for code in codes if code]
+        if not codes:
+            return
+
+        seen = set()
+        conflicts = set()
+        for code in codes:
+            if code in seen:
+                conflicts.add(code)
+            seen.add(code)
+
+        existing = self.search_read(
+            [('code', 'in', list(seen)), ('id', 'not in', list(exclude_ids))], ['code'])
+        conflicts.update(row['code'] for row in existing)
+
+        if conflicts:
+            raise ValidationError(_(
+                'The following codes are already used on %(model)s: %(codes)s',
+                model=self._description, codes=', '.join(sorted(conflicts)),
+            ))
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+
+from ..tools import timed
+
+MATERIAL_FIELDS = [
+    ('cost_per_sqm', 'Cost per m²'),
+]
+
+MACHINE_FIELDS = [
+    ('setup_cost_per_hour', 'Setup Cost per Hour'),
+    ('production_cost_per_hour', 'Production Cost per Hour'),
+    ('energy_cost_per_hour', 'Energy Cost per Hour'),
+    ('operator_cost_per_hour', 'Operator Cost per Hour'),
+    ('overhead_percentage', 'Overhead Percentage'),
+]
+
+
+class LabelPriceSimulationWizard(models.TransientModel):
+    _name = 'label.price.simulation.wizard'
+    _description = 'Price List What-If Simulation'
+
+    # Parameters
+    include_accepted = fields.Boolean(
+        string='Include Accepted Quotations',
+        help='Also simulate accepted quotations not yet produced; by default only draft and sent quotations'
+    )
+
+    delta_ids = fields.One2many(
+        'label.price.simulation.delta',
+        'wizard_id',
+        string='Price Changes'
+    )
+
+    # Results
+    quotation_count = fields.Integer(
+        string='Simulated Quotations',
+        readonly=True
+    )
+
+    current_cost = fields.Float(
+        string='Current Cost (€)',
+        readonly=True
+    )
+
+    simulated_cost = fields.Float(
+        string='Simulated Cost (€)',
+        readonly=True
+    )
+
+    current_margin = fields.Float(
+        string='Current Margin (€)',
+        readonly=True,
+        help='Quoted selling prices minus current costs'
+    )
+
+    simulated_margin = fields.Float(
+        string='Simulated Margin (€)',
+        readonly=True,
+        help='Quoted selling prices minus simulated costs'
+    )
+
+    margin_delta = fields.Float(
+        string='Margin Impact (€)',
+        readonly=True
+    )
+
+    report_data = fields.Text(
+        string='Report Data',
+        readonly=True
+    )
+
+    report_html = fields.Html(
+        string='Report HTML',
+        readonly=True
+    )
+
+    @timed()
+    def action_simulate(self):
+        """Recompute the backlog costs with the price changes, without writing them"""
+        self.ensure_one()
+        if np is None:
+            raise UserError(_('The price simulation requires the numpy Python library.'))
+
+        backlog = self._load_backlog(self._get_backlog_domain())
+        params = self._load_master_params(backlog)
+        simulated_params = self._apply_deltas(params, backlog)
+
+        # Both sides go through the same engine, so only the price changes show
+        current_total = self._simulate_costs(backlog, params, params)
+        simulated_total = self._simulate_costs(backlog, params, simulated_params)
+        report_data = self._build_report(backlog, current_total, simulated_total)
+
+        summary = report_data['summary']
+        self.write({
+            'quotation_count': summary['quotations'],
+            'current_cost': summary['current_cost'],
+            'simulated_cost': summary['simulated_cost'],
+            'current_margin': summary['current_margin'],
+            'simulated_margin': summary['simulated_margin'],
+            'margin_delta': summary['margin_delta'],
+            'report_data': str(report_data),
+            'report_html': self.env['production.analysis.report']._convert_to_html(report_data),
+        })
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'label.price.simulation.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+            'context': self.env.context,
+        }
+
+    def _get_backlog_domain(self):
+        states = ['draft', 'sent'] + (['accepted'] if self.include_accepted else [])
+        return [('state', 'in', states)]
+
+    # Snapshot
+    @api.model
+    def _load_backlog(self, domain, model_name='label.quotation'):
+        """Snapshot of the backlog as numpy arrays, one entry per quotation
+
+        Material and machine ids are replaced by their position in
+        ``carta_ids``/``macchina_ids``; quotations without one point to an
+        extra trailing slot whose parameters are all zero.
+
+        :param model_name: quotation model to read, ``label.quotation`` or a
+            model inheriting from it
+        """
+        rows = self.env[model_name].search_read(domain, [
+            'partner_id', 'carta_id', 'macchina_id', 'total_area_sqm', 'yield_percentage',
+            'linear_length', 'die_cost', 'machine_cost', 'total_cost', 'selling_price',
+        ], load=None)
+
+        carta_ids = sorted({row['carta_id'] for row in rows if row['carta_id']})
+        macchina_ids = sorted({row['macchina_id'] for row in rows if row['macchina_id']})
+        carta_index = {carta_id: index for index, carta_id in enumerate(carta_ids)}
+        macchina_index = {macchina_id: index for index, macchina_id in enumerate(macchina_ids)}
+
+        def column(name):
+            return np.array([row[name] or 0.0 for row in rows], dtype=float)
+
+        return {
+            'ids': np.array([row['id'] for row in rows], dtype=int),
+            'partner_id': np.array([row['partner_id'] or 0 for row in rows], dtype=int),
+            'carta_ids': carta_ids,
+            'macchina_ids': macchina_ids,
+            'carta': np.array([carta_index.get(row['carta_id'], len(carta_ids)) for row in rows], dtype=int),
+            'macchina': np.array([macchina_index.get(row['macchina_id'], len(macchina_ids)) for row in rows], dtype=int),
+            'total_area_sqm': column('total_area_sqm'),
+            'yield_percentage': column('yield_percentage'),
+            'linear_length': column('linear_length'),
+            'die_cost': column('die_cost'),
+            'machine_cost': column('machine_cost'),
+            'total_cost': column('total_cost'),
+            'selling_price': column('selling_price'),
+        }
+
+    @api.model
+    def _load_master_params(self, backlog):
+        """Current cost parameters per material and machine, trailing zero slot included"""
+        params = {}
+        cartas = self.env['label.carta'].browse(backlog['carta_ids'])
+        for fname, __ in MATERIAL_FIELDS:
+            params[fname] = np.array(cartas.mapped(fname) + [0.0], dtype=float)
+
+        machines = self.env['label.macchina'].browse(backlog['macchina_ids'])
+        for fname, __ in MACHINE_FIELDS:
+            params[fname] = np.array(machines.mapped(fname) + [0.0], dtype=float)
+        # Same defaults as the cost model
+        params['max_speed'] = np.array([machine.max_speed or 100 for machine in machines] + [100], dtype=float)
+        params['efficiency_factor'] = np.array(
+            [machine.efficiency_factor or 0.85 for machine in machines] + [0.85], dtype=float)
+        return params
+
+    def _apply_deltas(self, params, backlog):
+        """Copy of ``params`` with the wizard's price changes applied"""
+        simulated = {fname: values.copy() for fname, values in params.items()}
+        for delta in self.delta_ids:
+            if delta.target == 'material':
+                ids, record = backlog['carta_ids'], delta.carta_id
+            else:
+                ids, record = backlog['macchina_ids'], delta.macchina_id
+            if record:
+                if record.id not in ids:
+                    continue
+                positions = [ids.index(record.id)]
+            else:
+                positions = slice(0, len(ids))
+
+            values = simulated[delta.field_name]
+            if delta.change_type == 'percent':
+                values[positions] *= 1 + delta.value / 100
+            else:
+                values[positions] += delta.value
+        return simulated
+
+    # Cost engine
+    @api.model
+    def _simulate_costs(self, backlog, params, simulated_params):
+        """Total cost of every quotation under ``simulated_params``
+
+        Mirrors label.quotation._compute_costs. The setup hours of each job
+        are solved back from its stored machine cost under the current
+        parameters, so queue-dependent changeovers are kept as priced.
+        """
+        carta = backlog['carta']
+        macchina = backlog['macchina']
+        has_machine = macchina < len(backlog['macchina_ids'])
+        running = has_machine & (backlog['linear_length'] > 0)
+
+        # Paper: material area including waste at the simulated price per m²
+        yield_percentage = backlog['yield_percentage']
+        waste_multiplier = np.where(yield_percentage > 0, 100.0 / np.where(yield_percentage > 0, yield_percentage, 1), 1.0)
+        area = backlog['total_area_sqm'] * waste_multiplier
+        paper_cost = np.where(carta < len(backlog['carta_ids']), area * simulated_params['cost_per_sqm'][carta], 0.0)
+
+        # Machine: production hours from speed, setup hours from the stored cost
+        speed = params['max_speed'][macchina] * params['efficiency_factor'][macchina]
+        production_hours = np.where(running, backlog['linear_length'] / (speed * 60), 0.0)
+        setup_hours = self._setup_hours(backlog, params, production_hours, running)
+
+        machine_cost = np.where(
+            running,
+            self._machine_cost(simulated_params, macchina, production_hours, setup_hours),
+            0.0,
+        )
+        return paper_cost + backlog['die_cost'] + machine_cost
+
+    @api.model
+    def _setup_hours(self, backlog, params, production_hours, running):
+        """Setup hours solved from the stored machine cost under current parameters"""
+        macchina = backlog['macchina']
+        overhead = 1 + params['overhead_percentage'][macchina] / 100
+        time_rate = params['energy_cost_per_hour'][macchina] + params['operator_cost_per_hour'][macchina]
+        setup_rate = params['setup_cost_per_hour'][macchina] + time_rate
+        production_rate = params['production_cost_per_hour'][macchina] + time_rate
+        base_cost = backlog['machine_cost'] / overhead
+        setup_hours = (base_cost - production_hours * production_rate) / np.where(setup_rate > 0, setup_rate, 1)
+        return np.where(running & (setup_rate > 0), np.maximum(setup_hours, 0.0), 0.0)
+
+    @api.model
+    def _machine_cost(self, params, macchina, production_hours, setup_hours):
+        """Machine cost of label.quotation._compute_costs, vectorised"""
+        total_hours = production_hours + setup_hours
+        base_cost = (
+            setup_hours * params['setup_cost_per_hour'][macchina]
+            + production_hours * params['production_cost_per_hour'][macchina]
+            + total_hours * params['energy_cost_per_hour'][macchina]
+            + total_hours * params['operator_cost_per_hour'][macchina]
+        )
+        return base_cost * (1 + params['overhead_percentage'][macchina] / 100)
+
+    # Aggregation
+    @api.model
+    def _aggregate(self, keys, values):
+        """Sum ``values`` per distinct key: returns (distinct keys, sums, counts)"""
+        distinct, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=values, minlength=len(distinct))
+        counts = np.bincount(inverse, minlength=len(distinct))
+        return distinct, sums, counts
+
+    @api.model
+    def _build_report(self, backlog, current_total, simulated_total):
+        """Impact summary and per customer, material and machine breakdown"""
+        selling_price = backlog['selling_price']
+        current_margin = selling_price - current_total
+        simulated_margin = selling_price - simulated_total
+
+        report_data = {
+            'title': 'Price Simulation Report',
+            'period': _('Open quotations'),
+            'summary': {
+                'quotations': len(backlog['ids']),
+                'current_cost': round(float(current_total.sum()), 2),
+                'simulated_cost': round(float(simulated_total.sum()), 2),
+                'current_margin': round(float(current_margin.sum()), 2),
+                'simulated_margin': round(float(simulated_margin.sum()), 2),
+                'margin_delta': round(float((simulated_margin - current_margin).sum()), 2),
+            },
+            'details': [],
+        }
+
+        carta_ids = backlog['carta_ids'] + [False]
+        macchina_ids = backlog['macchina_ids'] + [False]
+        groupings = [
+            (_('Customer'), 'res.partner', backlog['partner_id'], lambda key: key),
+            (_('Material'), 'label.carta', backlog['carta'], lambda key: carta_ids[key]),
+            (_('Machine'), 'label.macchina', backlog['macchina'], lambda key: macchina_ids[key]),
+        ]
+        for label, model, keys, to_id in groupings:
+            distinct, current_costs, counts = self._aggregate(keys, current_total)
+            __, simulated_costs, __ = self._aggregate(keys, simulated_total)
+            __, current_margins, __ = self._aggregate(keys, current_margin)
+            __, simulated_margins, __ = self._aggregate(keys, simulated_margin)
+            names = {record.id: record.display_name for record in self.env[model].browse(
+                [to_id(key) for key in distinct if to_id(key)])}
+
+            rows = []
+            for index, key in enumerate(distinct):
+                rows.append({
+                    'group': label,
+                    'name': names.get(to_id(key), _('None')),
+                    'quotations': int(counts[index]),
+                    'current_cost': round(float(current_costs[index]), 2),
+                    'simulated_cost': round(float(simulated_costs[index]), 2),
+                    'current_margin': round(float(current_margins[index]), 2),
+                    'simulated_margin': round(float(simulated_margins[index]), 2),
+                    'margin_delta': round(float(simulated_margins[index] - current_margins[index]), 2),
+                })
+            rows.sort(key=lambda row: row['margin_delta'])
+            report_data['details'] += rows
+
+        return report_data
+
+
+class LabelPriceSimulationDelta(models.TransientModel):
+    _name = 'label.price.simulation.delta'
+    _description = 'Price Simulation Change'
+
+    wizard_id = fields.Many2one(
+        'label.price.simulation.wizard',
+        string='Simulation',
+        required=True,
+        ondelete='cascade'
+    )
+
+    target = fields.Selection([
+        ('material', 'Material'),
+        ('machine', 'Machine'),
+    ], string='Applies To', default='material', required=True)
+
+    carta_id = fields.Many2one(
+        'label.carta',
+        string='Paper Material',
+        help='Leave empty to change every material'
+    )
+
+    macchina_id = fields.Many2one(
+        'label.macchina',
+        string='Machine',
+        help='Leave empty to change every machine'
+    )
+
+    field_name = fields.Selection(
+        MATERIAL_FIELDS + MACHINE_FIELDS,
+        string='Price',
+        default='cost_per_sqm',
+        required=True
+    )
+
+    change_type = fields.Selection([
+        ('percent', 'Percentage'),
+        ('amount', 'Amount'),
+    ], string='Change', default='percent', required=True)
+
+    value = fields.Float(
+        string='Value',
+        help='Percentage or amount added to the current price; negative values lower it'
+    )
+
+    @api.onchange('target')
+    def _onchange_target(self):
+        """Keep the price field consistent with the target"""
+        material_fields = [fname for fname, __ in MATERIAL_FIELDS]
+        if self.target == 'material':
+            self.macchina_id = False
+            if self.field_name not in material_fields:
+                self.field_name = MATERIAL_FIELDS[0][0]
+        else:
+            self.carta_id = False
+            if self.field_name in material_fields:
+                self.field_name = MACHINE_FIELDS[0][0]
+
+    @api.constrains('target', 'field_name')
+    def _check_field_name(self):
+        """Validate the price field against the target"""
+        material_fields = [fname for fname, __ in MATERIAL_FIELDS]
+        for record in self:
+            if (record.target == 'material') != (record.field_name in material_fields):
+                raise ValidationError(_('The selected price does not belong to the chosen target.'))
@@ -4,10 +4,13 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from datetime import datetime, timedelta
 
+from ..tools import timed
+
 
 class ProductionAnalysisReport(models.TransientModel):
     _name = 'production.analysis.report'
     _description = 'Production Analysis Report Generator'
+    _inherit = ['label.run.profile.mixin']
 
     # Report Parameters
     date_from = fields.Date(
@@ -53,6 +56,7 @@ class ProductionAnalysisReport(models.TransientModel):
         readonly=True
     )
 
+    @timed()
     def action_generate_report(self):
         """Generate the selected report"""
         self.ensure_one()
@@ -72,23 +76,24 @@ class ProductionAnalysisReport(models.TransientModel):
         if self.material_ids:
             domain.append(('carta_id', 'in', self.material_ids.ids))
         
-        quotations = self.env['label.quotation'].search(domain)
-        
-        if self.report_type == 'efficiency':
-            report_data = self._generate_efficiency_report(quotations)
-        elif self.report_type == 'machine_utilization':
-            report_data = self._generate_machine_utilization_report(quotations)
-        elif self.report_type == 'cost_analysis':
-            report_data = self._generate_cost_analysis_report(quotations)
-        elif self.report_type == 'die_usage':
-            report_data = self._generate_die_usage_report(quotations)
-        elif self.report_type == 'material_consumption':
-            report_data = self._generate_material_consumption_report(quotations)
-        else:
-            report_data = {'error': 'Unknown report type'}
-        
-        # Convert to HTML
-        html_report = self._convert_to_html(report_data)
+        with self._profile_run(self.report_type):
+            quotations = self._get_report_quotations(domain)
+            
+            if self.report_type == 'efficiency':
+                report_data = self._generate_efficiency_report(quotations)
+            elif self.report_type == 'machine_utilization':
+                report_data = self._generate_machine_utilization_report(quotations)
+            elif self.report_type == 'cost_analysis':
+                report_data = self._generate_cost_analysis_report(quotations)
+            elif self.report_type == 'die_usage':
+                report_data = self._generate_die_usage_report(quotations)
+            elif self.report_type == 'material_consumption':
+                report_data = self._generate_material_consumption_report(quotations)
+            else:
+                report_data = {'error': 'Unknown report type'}
+            
+            # Convert to HTML
+            html_report = self._convert_to_html(report_data)
         
         self.write({
             'report_data': str(report_data),
@@ -104,6 +109,24 @@ class ProductionAnalysisReport(models.TransientModel):
             'context': self.env.context,
         }
 
+    def _get_report_quotations(self, domain):
+        """Quotations of the report, archived ones included when the period reaches them
+        
+        The archive is only queried when the period starts before its most
+        recent date.
+        
+        :return: tuple of ``label.quotation`` records followed by
+            ``label.quotation.archive`` records. It is not a recordset: the
+            generators may only iterate it, take its length and read the
+            field names both models share on each record.
+        """
+        sources = [self.env['label.quotation'].search(domain)]
+        Archive = self.env['label.quotation.archive']
+        archived_until = Archive._get_archived_until()
+        if archived_until and self.date_from <= archived_until:
+            sources.append(Archive.search(domain))
+        return tuple(record for records in sources for record in records)
+
     def _generate_efficiency_report(self, quotations):
         """Generate material efficiency analysis"""
         report_data = {
@@ -181,7 +204,8 @@ class ProductionAnalysisReport(models.TransientModel):
                         'quotations': 0,
                         'total_time': 0,
                         'total_length': 0,
-                        'total_cost': 0
+                        'total_cost': 0,
+                        'daily_hours': quotation.macchina_id.daily_capacity_hours or 16
                     }
                 
                 machine_usage[machine]['quotations'] += 1
@@ -192,9 +216,9 @@ class ProductionAnalysisReport(models.TransientModel):
         
         # Calculate utilization percentages
         days_in_period = (self.date_to - self.date_from).days + 1
-        available_hours = days_in_period * 16  # Assume 16 hours per day operation
         
         for machine, data in machine_usage.items():
+            available_hours = days_in_period * data.pop('daily_hours')
             data['utilization_percent'] = (data['total_time'] / available_hours) * 100 if available_hours else 0
             data['avg_time_per_job'] = data['total_time'] / data['quotations'] if data['quotations'] else 0
         
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+from datetime import datetime, time, timedelta
+
+from odoo import models, fields, api, _
+
+from ..tools import timed
+
+
+class LabelProductionSlot(models.Model):
+    _name = 'label.production.slot'
+    _description = 'Production Schedule Slot'
+    _rec_name = 'name'
+    _order = 'macchina_id, sequence'
+
+    name = fields.Char(
+        string='Job',
+        related='quotation_id.name',
+        store=True
+    )
+
+    quotation_id = fields.Many2one(
+        'label.quotation',
+        string='Quotation',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Customer',
+        related='quotation_id.partner_id'
+    )
+
+    macchina_id = fields.Many2one(
+        'label.macchina',
+        string='Machine',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    carta_id = fields.Many2one(
+        'label.carta',
+        string='Paper Material',
+        help='Material the job was planned with'
+    )
+
+    fustella_id = fields.Many2one(
+        'label.fustella',
+        string='Die',
+        help='Die the job was planned with'
+    )
+
+    sequence = fields.Integer(
+        string='Sequence',
+        default=0
+    )
+
+    date_start = fields.Datetime(
+        string='Start',
+        required=True
+    )
+
+    date_stop = fields.Datetime(
+        string='End',
+        required=True
+    )
+
+    setup_minutes = fields.Float(
+        string='Setup (min)',
+        help='Changeover time from the previous job on the machine'
+    )
+
+    run_minutes = fields.Float(
+        string='Run (min)',
+        help='Production time at effective machine speed'
+    )
+
+    # Scheduling engine
+    @api.model
+    def _job_key(self, quotation):
+        """Changeover key of a job: jobs sharing it need no die or material change"""
+        return (quotation.carta_id.id, quotation.fustella_id.id)
+
+    @api.model
+    def _run_minutes(self, quotation):
+        """Production minutes for a quotation on its machine"""
+        machine = quotation.macchina_id
+        machine_speed = machine.max_speed or 100  # m/min
+        efficiency = machine.efficiency_factor or 0.85
+        effective_speed = machine_speed * efficiency
+        return quotation.linear_length / effective_speed if effective_speed else 0
+
+    @api.model
+    def _working_time(self, machine, start, minutes):
+        """Return the moment ``minutes`` of machine time after ``start``
+
+        Machine time only runs inside the daily window starting at
+        ``shift_start_hour`` and lasting ``daily_capacity_hours``.
+        """
+        capacity = (machine.daily_capacity_hours or 24) * 60
+        if capacity >= 24 * 60:
+            return start + timedelta(minutes=minutes)
+
+        current = start
+        remaining = minutes
+        while True:
+            day_start = datetime.combine(current.date(), time()) + timedelta(hours=machine.shift_start_hour or 0)
+            if current < day_start - timedelta(days=1) + timedelta(minutes=capacity):
+                # Still inside yesterday's window when the shift crosses midnight
+                day_start -= timedelta(days=1)
+            day_end = day_start + timedelta(minutes=capacity)
+            if current < day_start:
+                current = day_start
+            if current >= day_end:
+                current = day_start + timedelta(days=1)
+                continue
+            available = (day_end - current).total_seconds() / 60
+            if remaining <= available:
+                return current + timedelta(minutes=remaining)
+            remaining -= available
+            current = day_start + timedelta(days=1)
+
+    @api.model
+    def _sequence_jobs(self, machine, quotations):
+        """Order a machine's jobs to cut changeovers
+
+        Jobs sharing a material and die are batched; batches are chained
+        greedily, preferring the cheapest changeover from the current batch and
+        the oldest quotation among equals (one priority queue per material, per
+        die and overall), then refined by relocation local search.
+        """
+        batches = {}
+        for quotation in quotations.sorted(lambda q: (q.date, q.id)):
+            batches.setdefault(self._job_key(quotation), []).append(quotation)
+
+        priority = {key: index for index, key in enumerate(batches)}
+        queue_all = [(priority[key], key) for key in batches]
+        queue_by_material = {}
+        queue_by_die = {}
+        for key in batches:
+            queue_by_material.setdefault(key[0], []).append((priority[key], key))
+            queue_by_die.setdefault(key[1], []).append((priority[key], key))
+
+        cost = machine._get_changeover_function()
+        done = set()
+
+        def peek(queue):
+            while queue and queue[0][1] in done:
+                heapq.heappop(queue)
+            return queue[0][1] if queue else None
+
+        sequence = []
+        current = None
+        while len(sequence) < len(batches):
+            candidates = [peek(queue_all)]
+            if current is not None:
+                candidates.append(peek(queue_by_material[current[0]]))
+                candidates.append(peek(queue_by_die[current[1]]))
+            following = min(
+                (key for key in candidates if key is not None),
+                key=lambda key: (cost(current, key), priority[key])
+            )
+            done.add(following)
+            sequence.append(following)
+            current = following
+
+        sequence = self._improve_sequence(machine, sequence)
+        return [quotation for key in sequence for quotation in batches[key]]
+
+    @api.model
+    def _improve_sequence(self, machine, sequence, max_passes=2):
+        """Relocation local search on the batch sequence"""
+        cost = machine._get_changeover_function()
+        for __ in range(max_passes):
+            improved = False
+            for key in list(sequence):
+                index = sequence.index(key)
+                previous = sequence[index - 1] if index else None
+                following = sequence[index + 1] if index + 1 < len(sequence) else None
+                gain = cost(previous, key) + cost(key, following) - cost(previous, following)
+
+                rest = sequence[:index] + sequence[index + 1:]
+                best_delta, best_position = gain, None
+                for position in range(len(rest) + 1):
+                    before = rest[position - 1] if position else None
+                    after = rest[position] if position < len(rest) else None
+                    delta = cost(before, key) + cost(key, after) - cost(before, after)
+                    if delta < best_delta - 1e-9:
+                        best_delta, best_position = delta, position
+
+                if best_position is not None:
+                    rest.insert(best_position, key)
+                    sequence = rest
+                    improved = True
+            if not improved:
+                break
+        return sequence
+
+    @api.model
+    def _timeline_vals(self, machine, quotations, start, previous=None, sequence=0):
+        """Build slot values for consecutive jobs starting at ``start``"""
+        cost = machine._get_changeover_function()
+        vals_list = []
+        cursor = start
+        for quotation in quotations:
+            key = self._job_key(quotation)
+            setup = cost(previous, key)
+            run = self._run_minutes(quotation)
+            date_start = self._working_time(machine, cursor, 0)
+            date_stop = self._working_time(machine, date_start, setup + run)
+            vals_list.append({
+                'quotation_id': quotation.id,
+                'macchina_id': machine.id,
+                'carta_id': key[0],
+                'fustella_id': key[1],
+                'sequence': sequence,
+                'date_start': date_start,
+                'date_stop': date_stop,
+                'setup_minutes': setup,
+                'run_minutes': run,
+            })
+            cursor = date_stop
+            previous = key
+            sequence += 1
+        return vals_list
+
+    @api.model
+    @timed()
+    def _plan_machines(self, machines, start=None):
+        """Rebuild the plan of the given machines from accepted quotations"""
+        start = start or fields.Datetime.now().replace(second=0, microsecond=0)
+        self.search([('macchina_id', 'in', machines.ids)]).unlink()
+
+        quotations = self.env['label.quotation'].search([
+            ('state', '=', 'accepted'),
+            ('macchina_id', 'in', machines.ids),
+        ])
+        jobs_by_machine = quotations.grouped('macchina_id')
+
+        vals_list = []
+        for machine in machines:
+            jobs = jobs_by_machine.get(machine)
+            if not jobs:
+                continue
+            ordered = self._sequence_jobs(machine, jobs)
+            vals_list += self._timeline_vals(machine, ordered, start)
+        slots = self.create(vals_list)
+        self._recompute_plan_costs(machines)
+
+        # Die wear forecasts follow the planned dates
+        self.env['label.fustella.usage']._sync_quotations(quotations)
+        return slots
+
+    @api.model
+    def _recompute_plan_costs(self, machines):
+        """Re-cost the draft quotations whose setup depends on the queues of ``machines``
+
+        Drafts pay the cheapest marginal changeover over the queue, so they go
+        stale whenever a queue changes. Sent and accepted quotations keep the
+        price given to the customer: planning only moves them in the queue.
+        """
+        if not machines:
+            return
+        Quotation = self.env['label.quotation']
+        quotations = Quotation.search([
+            ('macchina_id', 'in', machines.ids),
+            ('state', '=', 'draft'),
+        ])
+        for field in Quotation._fields.values():
+            if field.store and field.compute in ('_compute_costs', '_compute_selling_price'):
+                self.env.add_to_compute(field, quotations)
+
+    @api.model
+    def _best_insert_position(self, machine, jobs, quotation):
+        """Queue position adding the least changeover time for ``quotation``"""
+        keys = [self._job_key(job) for job in jobs]
+        return machine._marginal_setup_minutes(self._job_key(quotation), keys)[1]
+
+    @api.model
+    def _get_machine_queues(self, machines):
+        """Planned queues of the given machines, read in a single query
+
+        :return: ``{machine_id: {'keys': [job keys in plan order],
+            'planned': {quotation_id: setup_minutes}}}``
+        """
+        queues = {machine_id: {'keys': [], 'planned': {}} for machine_id in machines.ids}
+        rows = self.search_read(
+            [('macchina_id', 'in', machines.ids)],
+            ['macchina_id', 'quotation_id', 'carta_id', 'fustella_id', 'setup_minutes'],
+            order='macchina_id, sequence',
+        )
+        for row in rows:
+            queue = queues[row['macchina_id'][0]]
+            queue['keys'].append((
+                row['carta_id'] and row['carta_id'][0],
+                row['fustella_id'] and row['fustella_id'][0],
+            ))
+            queue['planned'][row['quotation_id'][0]] = row['setup_minutes']
+        return queues
+
+    @api.model
+    @timed()
+    def _replan_quotations(self, quotations):
+        """Re-plan only the queue tails touched by changed quotations
+
+        Changed jobs leave their current queue and are re-inserted at their
+        cheapest position; jobs ahead of the first change keep their slots.
+        Machines that were never planned are left alone.
+        """
+        existing = self.search([('quotation_id', 'in', quotations.ids)])
+        accepted = quotations.filtered(lambda q: q.state == 'accepted')
+        machines = existing.macchina_id | accepted.macchina_id
+        if not machines:
+            return
+
+        queues = self.search([('macchina_id', 'in', machines.ids)]).grouped('macchina_id')
+        now = fields.Datetime.now().replace(second=0, microsecond=0)
+        for machine in machines:
+            slots = queues.get(machine, self.browse())
+            if not slots:
+                continue
+
+            kept = slots.filtered(lambda slot: slot.quotation_id not in quotations)
+            first_change = len(slots)
+            for index, slot in enumerate(slots):
+                if slot.quotation_id in quotations:
+                    first_change = index
+                    break
+
+            jobs = list(kept.quotation_id)
+            for quotation in accepted.filtered(lambda q: q.macchina_id == machine):
+                position = self._best_insert_position(machine, jobs, quotation)
+                jobs.insert(position, quotation)
+                first_change = min(first_change, position)
+
+            (slots - kept).unlink()
+            if first_change >= len(jobs):
+                continue
+
+            if first_change:
+                anchor = kept[first_change - 1]
+                start, previous = anchor.date_stop, self._job_key(anchor.quotation_id)
+            else:
+                start, previous = (slots[:1].date_start or now), None
+
+            slot_by_quotation = {slot.quotation_id: slot for slot in kept}
+            vals_list = self._timeline_vals(machine, jobs[first_change:], start, previous, first_change)
+            new_vals = []
+            for quotation, vals in zip(jobs[first_change:], vals_list):
+                slot = slot_by_quotation.get(quotation)
+                if slot:
+                    slot.write(vals)
+                else:
+                    new_vals.append(vals)
+            self.create(new_vals)
+        self._recompute_plan_costs(machines)
+
+
+class ProductionScheduleWizard(models.TransientModel):
+    _name = 'production.schedule.wizard'
+    _description = 'Machine Scheduling Wizard'
+
+    machine_ids = fields.Many2many(
+        'label.macchina',
+        string='Machines',
+        help='Leave empty to plan all active machines'
+    )
+
+    date_start = fields.Datetime(
+        string='Plan From',
+        default=fields.Datetime.now,
+        required=True
+    )
+
+    # Results
+    planned_jobs = fields.Integer(
+        string='Planned Jobs',
+        readonly=True
+    )
+
+    setup_hours = fields.Float(
+        string='Setup Time (hours)',
+        readonly=True,
+        help='Total changeover time in the plan'
+    )
+
+    saved_setup_hours = fields.Float(
+        string='Setup Time Saved (hours)',
+        readonly=True,
+        help='Changeover time saved compared to a full setup for every job'
+    )
+
+    def action_plan(self):
+        """Plan accepted quotations onto machine capacity"""
+        self.ensure_one()
+
+        machines = self.machine_ids or self.env['label.macchina'].search([('active', '=', True)])
+        slots = self.env['label.production.slot']._plan_machines(machines, self.date_start)
+
+        full_setup = sum(
+            slot.macchina_id._changeover_minutes(None, (slot.carta_id.id, slot.fustella_id.id))
+            for slot in slots
+        )
+        setup = sum(slots.mapped('setup_minutes'))
+        self.write({
+            'planned_jobs': len(slots),
+            'setup_hours': setup / 60,
+            'saved_setup_hours': (full_setup - setup) / 60,
+        })
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Production Plan'),
+            'res_model': 'label.production.slot',
+            'view_mode': 'calendar,list',
+            'domain': [('macchina_id', 'in', machines.ids)],
+            'context': {'search_default_group_machine': 1},
+            'target': 'current',
+        }
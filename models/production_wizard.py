@@ -3,10 +3,13 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from ..tools import timed
+
 
 class ProductionOptimizationWizard(models.TransientModel):
     _name = 'production.optimization.wizard'
     _description = 'Production Parameters Optimization Wizard'
+    _inherit = ['label.run.profile.mixin']
 
     # Input parameters
     label_width = fields.Float(
@@ -65,6 +68,12 @@ class ProductionOptimizationWizard(models.TransientModel):
         help='Preferred interspace between labels'
     )
     
+    exclude_worn_dies = fields.Boolean(
+        string='Exclude Dies Near End of Life',
+        default=False,
+        help='Leave out dies whose used and backlog cuts reach their end of life threshold'
+    )
+    
     # Results
     optimization_results = fields.Text(
         string='Optimization Results',
@@ -131,6 +140,20 @@ class ProductionOptimizationWizard(models.TransientModel):
         
         return res
 
+    @api.onchange('exclude_worn_dies')
+    def _onchange_exclude_worn_dies(self):
+        """Drop the worn dies from the current selection, keeping the user's choice"""
+        if self.exclude_worn_dies:
+            self.available_dies = self._get_candidate_dies()
+
+    def _get_candidate_dies(self):
+        """Selected dies the optimizer may use, without the worn ones when excluded"""
+        self.ensure_one()
+        if not self.exclude_worn_dies:
+            return self.available_dies
+        return self.available_dies.filtered(lambda die: not die.near_end_of_life)
+
+    @timed()
     def action_optimize(self):
         """Run optimization algorithm"""
         self.ensure_one()
@@ -138,7 +161,8 @@ class ProductionOptimizationWizard(models.TransientModel):
         if not self.label_width or not self.label_height or not self.total_quantity:
             raise ValidationError(_('Please provide all required measurements.'))
         
-        best_solution = self._find_optimal_configuration()
+        with self._profile_run('optimization'):
+            best_solution = self._find_optimal_configuration()
         
         # Update wizard with results
         self.write({
@@ -161,6 +185,7 @@ class ProductionOptimizationWizard(models.TransientModel):
             'context': self.env.context,
         }
 
+    @timed()
     def _find_optimal_configuration(self):
         """Find the optimal production configuration"""
         self.ensure_one()
@@ -170,7 +195,7 @@ class ProductionOptimizationWizard(models.TransientModel):
         
         # Test different configurations
         for machine in self.available_machines:
-            for die in self.available_dies:
+            for die in self._get_candidate_dies():
                 for tracks in range(1, min(self.max_tracks_preference + 1, 
                                          machine.max_tracks or 10,
                                          die.max_tracks or 10)):
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, _
+from odoo.exceptions import AccessError, UserError
+
+from ..tools import timed
+
+# Inputs of the selling price; changing one voids the approval decision
+APPROVAL_RESET_FIELDS = {
+    'label_width', 'label_height', 'interspace', 'tracks', 'total_quantity',
+    'carta_id', 'fustella_id', 'macchina_id', 'margin_percentage', 'company_id',
+}
+
+
+class LabelQuotation(models.Model):
+    _inherit = 'label.quotation'
+
+    approval_state = fields.Selection([
+        ('pending', 'Pending Approval'),
+        ('approved', 'Approved'),
+        ('refused', 'Refused'),
+    ], string='Approval', readonly=True, copy=False, tracking=True,
+        index='btree_not_null',
+        help='Set on quotations whose value is above the approval threshold of their company')
+
+    approved_by_id = fields.Many2one(
+        'res.users',
+        string='Approved By',
+        readonly=True,
+        copy=False
+    )
+
+    def write(self, vals):
+        """Void the approval decision of quotations whose price inputs change"""
+        if APPROVAL_RESET_FIELDS & set(vals) and 'approval_state' not in vals:
+            decided = self.filtered('approval_state')
+            if decided:
+                decided._get_approval_activities().unlink()
+                vals = dict(vals, approval_state=False, approved_by_id=False)
+        return super().write(vals)
+
+    def action_send_quotation(self):
+        """Send quotation to customer, once approved when its value requires it"""
+        allowed = self._check_approval()
+        res = super(LabelQuotation, allowed).action_send_quotation()
+        return (self - allowed)._notify_held(_('sent')) or res
+
+    def action_accept_quotation(self):
+        """Accept quotation, once approved when its value requires it"""
+        allowed = self._check_approval()
+        res = super(LabelQuotation, allowed).action_accept_quotation()
+        return (self - allowed)._notify_held(_('accepted')) or res
+
+    def action_approve(self):
+        """Approve the pending quotations and close their approval activities"""
+        self._check_approver()
+        self.write({'approval_state': 'approved', 'approved_by_id': self.env.user.id})
+        self._get_approval_activities().action_feedback(feedback=_('Approved'))
+        return True
+
+    def action_refuse_approval(self):
+        """Refuse the pending quotations and close their approval activities"""
+        self._check_approver()
+        self.write({'approval_state': 'refused', 'approved_by_id': False})
+        self._get_approval_activities().action_feedback(feedback=_('Refused'))
+        return True
+
+    @timed()
+    def _check_approval(self):
+        """Quotations free to proceed; approval is requested for the others
+
+        Refused quotations stay blocked without a new request until they are
+        edited, which clears the refusal.
+        """
+        blocked = self._filter_approval_required().filtered(lambda q: q.approval_state != 'approved')
+        blocked.filtered(lambda q: not q.approval_state)._request_approval()
+        return self - blocked
+
+    def _notify_held(self, action):
+        """Log the hold on the quotations and warn the user they were left as they are
+
+        :param action: past participle of the blocked action, e.g. "sent"
+        :return: notification action, or None when no quotation was held
+        """
+        if not self:
+            return None
+        self._message_log_batch(
+            bodies={
+                quotation.id: (
+                    _('Not %s: approval refused, edit the quotation to request it again.') % action
+                    if quotation.approval_state == 'refused'
+                    else _('Not %s: waiting for approval.') % action
+                )
+                for quotation in self
+            },
+        )
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Approval Required'),
+                'message': _('%(count)s quotation(s) held for approval were not %(action)s: %(names)s',
+                             count=len(self), action=action, names=', '.join(self.mapped('name'))),
+                'type': 'warning',
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            }
+        }
+
+    def _filter_approval_required(self):
+        """Quotations whose value needs an approval under their company's configuration"""
+        Config = self.env['label.config']
+        return self.filtered(
+            lambda q: Config.check_approval_required(q.selling_price, q.company_id.id or None))
+
+    def _get_approvers(self, config):
+        """Users asked to approve: the configured approvers, else the administrator"""
+        return config.approval_user_ids or self.env.ref('base.user_admin')
+
+    def _request_approval(self):
+        """Mark the quotations pending and queue their approval activities in one create"""
+        if not self:
+            return
+        self.write({'approval_state': 'pending', 'approved_by_id': False})
+
+        activity_type = self.env.ref('label_quotation.mail_activity_data_quotation_approval')
+        model_id = self.env['ir.model']._get_id(self._name)
+        today = fields.Date.context_today(self)
+        vals_list = []
+        for company, quotations in self.grouped('company_id').items():
+            approvers = self._get_approvers(self.env['label.config'].get_config(company.id))
+            for quotation in quotations:
+                for approver in approvers:
+                    vals_list.append({
+                        'res_model_id': model_id,
+                        'res_id': quotation.id,
+                        'activity_type_id': activity_type.id,
+                        'summary': _('Approve %s (%s)') % (quotation.name, quotation.partner_id.display_name),
+                        'user_id': approver.id,
+                        'date_deadline': today,
+                    })
+        self.env['mail.activity'].sudo().create(vals_list)
+
+    def _get_approval_activities(self):
+        """Open approval activities of the quotations"""
+        return self.env['mail.activity'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_id', 'in', self.ids),
+            ('activity_type_id', '=', self.env.ref('label_quotation.mail_activity_data_quotation_approval').id),
+        ])
+
+    def _check_approver(self):
+        """Only pending quotations, decided by the approvers of their companies"""
+        if self.filtered(lambda q: q.approval_state != 'pending'):
+            raise UserError(_('Only quotations pending approval can be approved or refused.'))
+        if self.env.is_superuser():
+            return
+        Config = self.env['label.config']
+        for company in self.company_id:
+            if self.env.user not in self._get_approvers(Config.get_config(company.id)):
+                raise AccessError(_('You are not allowed to approve quotations of %s.') % company.name)
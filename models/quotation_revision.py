@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+# Inputs a revision may change; everything else comes from the parent
+REVISION_FIELDS = [
+    'label_width', 'label_height', 'interspace', 'tracks', 'total_quantity',
+    'carta_id', 'fustella_id', 'macchina_id', 'margin_percentage',
+]
+
+
+class LabelQuotation(models.Model):
+    _inherit = 'label.quotation'
+
+    revision_ids = fields.One2many(
+        'label.quotation.revision',
+        'quotation_id',
+        string='Revisions'
+    )
+
+
+class LabelQuotationRevision(models.Model):
+    _name = 'label.quotation.revision'
+    _description = 'Label Quotation Revision'
+    _rec_name = 'name'
+    _order = 'quotation_id, revision_number'
+
+    name = fields.Char(
+        string='Revision',
+        compute='_compute_name',
+        store=True
+    )
+
+    quotation_id = fields.Many2one(
+        'label.quotation',
+        string='Quotation',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    revision_number = fields.Integer(
+        string='Revision Number',
+        readonly=True
+    )
+
+    changes = fields.Json(
+        string='Changed Inputs',
+        readonly=True,
+        help='Input values that differ from the quotation; the rest is read from it'
+    )
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('sent', 'Sent'),
+    ], string='Status', default='draft', required=True)
+
+    sent_quotation_id = fields.Many2one(
+        'label.quotation',
+        string='Sent Quotation',
+        readonly=True,
+        ondelete='set null',
+        help='Quotation created from the revision; it stays in draft while held for approval'
+    )
+
+    # Inputs, read from the changes or the quotation
+    label_width = fields.Float(
+        string='Label Width (mm)',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    label_height = fields.Float(
+        string='Label Height (mm)',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    interspace = fields.Float(
+        string='Interspace (mm)',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    tracks = fields.Integer(
+        string='Number of Tracks',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    total_quantity = fields.Integer(
+        string='Total Quantity',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    carta_id = fields.Many2one(
+        'label.carta',
+        string='Paper Material',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    fustella_id = fields.Many2one(
+        'label.fustella',
+        string='Die',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    macchina_id = fields.Many2one(
+        'label.macchina',
+        string='Machine',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    margin_percentage = fields.Float(
+        string='Margin (%)',
+        compute='_compute_inputs',
+        inverse='_inverse_inputs'
+    )
+
+    # Figures, costed on demand
+    yield_percentage = fields.Float(
+        string='Yield (%)',
+        compute='_compute_figures'
+    )
+
+    total_cost = fields.Float(
+        string='Total Cost (€)',
+        compute='_compute_figures'
+    )
+
+    selling_price = fields.Float(
+        string='Selling Price (€)',
+        compute='_compute_figures'
+    )
+
+    price_per_label = fields.Float(
+        string='Price per Label (€)',
+        compute='_compute_figures',
+        digits=(12, 6)
+    )
+
+    @api.depends('quotation_id.name', 'revision_number')
+    def _compute_name(self):
+        """Quotation number followed by the revision number"""
+        for revision in self:
+            revision.name = f'{revision.quotation_id.name}-R{revision.revision_number}'
+
+    @api.depends('changes', *(f'quotation_id.{fname}' for fname in REVISION_FIELDS))
+    def _compute_inputs(self):
+        """Changed values, falling back on the quotation for the others"""
+        for revision in self:
+            changes = revision.changes or {}
+            for fname in REVISION_FIELDS:
+                revision[fname] = changes[fname] if fname in changes else revision.quotation_id[fname]
+
+    def _inverse_inputs(self):
+        """Keep only the values differing from the quotation"""
+        for revision in self:
+            parent_vals = revision.quotation_id._convert_to_write(
+                {fname: revision.quotation_id[fname] for fname in REVISION_FIELDS})
+            vals = revision._get_input_vals()
+            revision.changes = {fname: value for fname, value in vals.items() if value != parent_vals[fname]}
+
+    def _get_input_vals(self):
+        """Inputs of the revision as values to write on a quotation"""
+        self.ensure_one()
+        return self._convert_to_write({fname: self[fname] for fname in REVISION_FIELDS})
+
+    @api.depends('quotation_id', *REVISION_FIELDS)
+    def _compute_figures(self):
+        """Cost every revision in one batch of in-memory quotations"""
+        revisions = self.filtered('quotation_id')
+        (self - revisions).update({
+            'yield_percentage': 0,
+            'total_cost': 0,
+            'selling_price': 0,
+            'price_per_label': 0,
+        })
+        variants = self.env['label.quotation']._new_variants([
+            dict(revision.quotation_id._get_variant_vals(), **revision._get_input_vals())
+            for revision in revisions
+        ], [revision.quotation_id for revision in revisions])
+        for revision, variant in zip(revisions, variants):
+            revision.yield_percentage = variant.yield_percentage
+            revision.total_cost = variant.total_cost
+            revision.selling_price = variant.selling_price
+            revision.price_per_label = variant.price_per_label
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Number revisions per quotation"""
+        quotation_ids = {vals['quotation_id'] for vals in vals_list if vals.get('quotation_id')}
+        last_numbers = dict(self._read_group(
+            [('quotation_id', 'in', list(quotation_ids))],
+            ['quotation_id'],
+            ['revision_number:max'],
+        ))
+        next_numbers = {quotation.id: number + 1 for quotation, number in last_numbers.items()}
+        for vals in vals_list:
+            quotation_id = vals.get('quotation_id')
+            vals['revision_number'] = next_numbers.get(quotation_id, 1)
+            next_numbers[quotation_id] = vals['revision_number'] + 1
+        return super().create(vals_list)
+
+    def action_send(self):
+        """Materialise the revisions as quotations and send them
+
+        Revisions whose quotation is held for approval stay in draft and
+        reuse that quotation when sent again, updated with the inputs the
+        revision has by then.
+        """
+        if self.filtered(lambda r: r.state != 'draft'):
+            raise UserError(_('Only draft revisions can be sent.'))
+
+        quotations = self.env['label.quotation']
+        for revision in self:
+            quotation = revision.sent_quotation_id
+            if quotation.state == 'draft':
+                current_vals = quotation._convert_to_write({fname: quotation[fname] for fname in REVISION_FIELDS})
+                updates = {
+                    fname: value for fname, value in revision._get_input_vals().items()
+                    if value != current_vals[fname]
+                }
+                if updates:
+                    quotation.write(updates)
+            else:
+                quotation = revision.quotation_id.copy(dict(
+                    revision.changes or {},
+                    state='draft',
+                    valid_until=False,
+                    sale_order_id=False,
+                ))
+            quotations += quotation
+        quotations.action_send_quotation()
+
+        for revision, quotation in zip(self, quotations):
+            vals = {'sent_quotation_id': quotation.id}
+            if quotation.state == 'sent':
+                vals['state'] = 'sent'
+            revision.write(vals)
+        return True
+
+    def action_open_sent_quotation(self):
+        """Open the quotation created from the revision"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'label.quotation',
+            'res_id': self.sent_quotation_id.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _, Command
+
+from ..tools import timed
+
+# Fields copied onto every what-if variant of a quotation
+SCENARIO_FIELDS = [
+    'company_id', 'partner_id', 'date', 'state', 'label_width', 'label_height',
+    'interspace', 'tracks', 'total_quantity', 'carta_id', 'fustella_id',
+    'macchina_id', 'margin_percentage',
+]
+
+SENSITIVITY_PARAMETERS = [
+    ('tracks', 'Tracks'),
+    ('interspace', 'Interspace'),
+    ('total_quantity', 'Quantity'),
+    ('macchina_id', 'Machine'),
+    ('fustella_id', 'Die'),
+]
+
+
+class LabelQuotation(models.Model):
+    _inherit = 'label.quotation'
+
+    def _get_variant_vals(self):
+        """Input values a what-if variant of the quotation starts from"""
+        self.ensure_one()
+        return self._convert_to_write({fname: self[fname] for fname in SCENARIO_FIELDS})
+
+    @api.model
+    def _new_variants(self, vals_list, origins=None):
+        """In-memory quotations for ``vals_list``, nothing written to the database
+
+        The variants share one prefetch set, so reading a computed figure on
+        any of them runs the compute chain once over all of them.
+
+        :param origins: quotations the variants are taken from, one per
+            values dict, so a variant keeps its original's place in the plan
+        """
+        origins = origins or [None] * len(vals_list)
+        return self.concat(*(self.new(vals, origin=origin) for vals, origin in zip(vals_list, origins)))
+
+    def action_sensitivity_analysis(self):
+        """Open the sensitivity panel of the quotation"""
+        self.ensure_one()
+        wizard = self.env['label.quotation.sensitivity.wizard'].create({'quotation_id': self.id})
+        wizard.action_analyze()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Sensitivity Analysis'),
+            'res_model': 'label.quotation.sensitivity.wizard',
+            'res_id': wizard.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+
+class LabelQuotationSensitivityWizard(models.TransientModel):
+    _name = 'label.quotation.sensitivity.wizard'
+    _description = 'Quotation Sensitivity Analysis'
+
+    quotation_id = fields.Many2one(
+        'label.quotation',
+        string='Quotation',
+        required=True,
+        ondelete='cascade'
+    )
+
+    interspace_step = fields.Float(
+        string='Interspace Step (mm)',
+        default=1.0
+    )
+
+    quantity_step = fields.Float(
+        string='Quantity Step (%)',
+        default=10.0
+    )
+
+    # Results
+    total_cost = fields.Float(
+        string='Total Cost (€)',
+        readonly=True
+    )
+
+    price_per_label = fields.Float(
+        string='Price per Label (€)',
+        readonly=True,
+        digits=(12, 6)
+    )
+
+    line_ids = fields.One2many(
+        'label.quotation.sensitivity.line',
+        'wizard_id',
+        string='Scenarios',
+        readonly=True
+    )
+
+    @timed()
+    def action_analyze(self):
+        """Cost every scenario of the quotation in one batch of in-memory variants"""
+        self.ensure_one()
+        scenarios = self._get_scenarios()
+        baseline, *variants = self._evaluate_scenarios([{}] + [scenario['vals'] for scenario in scenarios])
+
+        lines = []
+        for scenario, (total_cost, price_per_label) in zip(scenarios, variants):
+            lines.append(Command.create({
+                'parameter': scenario['parameter'],
+                'scenario': scenario['name'],
+                'total_cost': total_cost,
+                'cost_delta': total_cost - baseline[0],
+                'price_per_label': price_per_label,
+                'price_delta': price_per_label - baseline[1],
+                'elasticity': self._elasticity(scenario, baseline[0], total_cost),
+            }))
+
+        self.line_ids.unlink()
+        self.write({
+            'total_cost': baseline[0],
+            'price_per_label': baseline[1],
+            'line_ids': lines,
+        })
+        return True
+
+    def _get_scenarios(self):
+        """One-at-a-time perturbations of the quotation inputs
+
+        :return: list of dicts with the ``parameter`` changed, the scenario
+            ``name``, the changed ``vals`` and, for numeric inputs, the input
+            value ``before`` and ``after`` the change
+        """
+        quotation = self.quotation_id
+        scenarios = []
+
+        def numeric(parameter, before, after, name):
+            scenarios.append({
+                'parameter': parameter,
+                'name': name,
+                'vals': {parameter: after},
+                'before': before,
+                'after': after,
+            })
+
+        for step in (-1, 1):
+            tracks = quotation.tracks + step
+            if tracks >= 1:
+                numeric('tracks', quotation.tracks, tracks, _('%s tracks') % tracks)
+
+        for step in (-self.interspace_step, self.interspace_step):
+            interspace = quotation.interspace + step
+            if step and interspace >= 0:
+                numeric('interspace', quotation.interspace, interspace, _('%s mm interspace') % interspace)
+
+        for step in (-self.quantity_step, self.quantity_step):
+            quantity = int(quotation.total_quantity * (1 + step / 100))
+            if step and quantity > 0:
+                numeric('total_quantity', quotation.total_quantity, quantity, _('%s labels') % quantity)
+
+        machines = self.env['label.macchina'].search([('id', '!=', quotation.macchina_id.id)])
+        for machine in machines:
+            scenarios.append({
+                'parameter': 'macchina_id',
+                'name': machine.display_name,
+                'vals': {'macchina_id': machine.id},
+            })
+
+        # Dies cutting the same label size
+        dies = self.env['label.fustella'].search([
+            ('id', '!=', quotation.fustella_id.id),
+            ('width', '=', quotation.label_width),
+            ('length', '=', quotation.label_height),
+        ])
+        for die in dies:
+            scenarios.append({
+                'parameter': 'fustella_id',
+                'name': die.display_name,
+                'vals': {'fustella_id': die.id},
+            })
+        return scenarios
+
+    def _evaluate_scenarios(self, vals_list):
+        """Total cost and price per label of the quotation under each change"""
+        base_vals = self.quotation_id._get_variant_vals()
+        variants = self.env['label.quotation']._new_variants(
+            [dict(base_vals, **vals) for vals in vals_list],
+            [self.quotation_id] * len(vals_list),
+        )
+        return [(variant.total_cost, variant.price_per_label) for variant in variants]
+
+    @api.model
+    def _elasticity(self, scenario, base_cost, total_cost):
+        """Relative cost change over relative input change, for numeric inputs"""
+        before = scenario.get('before')
+        if not before or not base_cost:
+            return 0.0
+        return ((total_cost - base_cost) / base_cost) / ((scenario['after'] - before) / before)
+
+
+class LabelQuotationSensitivityLine(models.TransientModel):
+    _name = 'label.quotation.sensitivity.line'
+    _description = 'Quotation Sensitivity Scenario'
+    _order = 'wizard_id, id'
+
+    wizard_id = fields.Many2one(
+        'label.quotation.sensitivity.wizard',
+        string='Analysis',
+        required=True,
+        ondelete='cascade'
+    )
+
+    parameter = fields.Selection(
+        SENSITIVITY_PARAMETERS,
+        string='Parameter',
+        required=True
+    )
+
+    scenario = fields.Char(
+        string='Scenario'
+    )
+
+    total_cost = fields.Float(
+        string='Total Cost (€)'
+    )
+
+    cost_delta = fields.Float(
+        string='Cost Change (€)'
+    )
+
+    price_per_label = fields.Float(
+        string='Price per Label (€)',
+        digits=(12, 6)
+    )
+
+    price_delta = fields.Float(
+        string='Price per Label Change (€)',
+        digits=(12, 6)
+    )
+
+    elasticity = fields.Float(
+        string='Cost Elasticity',
+        help='Relative change of the total cost for a relative change of the input; empty for machine and die swaps'
+    )
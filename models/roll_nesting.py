@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+import math
+from collections import Counter
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+from ..tools import timed
+
+
+class _ResidualTree:
+    """Max segment tree over roll residual widths.
+
+    Finds the first (lowest index) roll whose residual width can hold an item
+    in O(log n), which keeps first-fit decreasing near-linear on thousands of
+    strips instead of scanning every open roll for every strip.
+    """
+
+    def __init__(self, size, capacity):
+        self.size = 1
+        while self.size < max(size, 1):
+            self.size *= 2
+        self.capacity = capacity
+        self.tree = [capacity] * (2 * self.size)
+
+    def first_fit(self, width):
+        """Return the index of the first roll with residual >= width"""
+        if self.tree[1] + 1e-9 < width:
+            return None
+        node = 1
+        while node < self.size:
+            node *= 2
+            if self.tree[node] + 1e-9 < width:
+                node += 1
+        return node - self.size
+
+    def residual(self, index):
+        return self.tree[index + self.size]
+
+    def consume(self, index, width):
+        node = index + self.size
+        self.tree[node] -= width
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+
+def first_fit_decreasing(strips, roll_width):
+    """Pack strips across standard rolls with first-fit decreasing.
+
+    :param strips: list of ``(key, width, demand)`` tuples where ``demand`` is
+        the number of standard roll lengths the strip must run for
+    :param roll_width: usable width of one standard roll in mm
+    :return: list of rolls, each roll being a list of strip keys
+    """
+    strips = sorted((s for s in strips if s[2] > 0), key=lambda s: s[1], reverse=True)
+    total_demand = sum(s[2] for s in strips)
+    tree = _ResidualTree(total_demand, roll_width)
+    rolls = []
+
+    for key, width, demand in strips:
+        remaining = demand
+        while remaining:
+            index = tree.first_fit(width)
+            if index is None:
+                # Wider than the roll itself, cannot be nested
+                break
+            if index == len(rolls):
+                rolls.append([])
+            # Place as many copies as fit in this roll at once
+            copies = min(remaining, int((tree.residual(index) + 1e-9) // width))
+            rolls[index].extend([key] * copies)
+            tree.consume(index, width * copies)
+            remaining -= copies
+    return rolls
+
+
+def rolls_lower_bound(strips, roll_width):
+    """Lower bound on the number of rolls (max of L1 and the large-item bound)"""
+    total_width = sum(width * demand for __, width, demand in strips)
+    l1 = math.ceil(total_width / roll_width - 1e-9) if roll_width else 0
+    large = sum(demand for __, width, demand in strips if width > roll_width / 2)
+    return max(l1, large)
+
+
+class ProductionNestingWizard(models.TransientModel):
+    _name = 'production.nesting.wizard'
+    _description = 'Roll Width Nesting Optimizer'
+
+    # Parameters
+    material_ids = fields.Many2many(
+        'label.carta',
+        string='Materials',
+        help='Leave empty to include all materials'
+    )
+
+    machine_ids = fields.Many2many(
+        'label.macchina',
+        string='Machines',
+        help='Leave empty to include all machines'
+    )
+
+    edge_margin = fields.Float(
+        string='Edge Margin (mm)',
+        default=5.0,
+        help='Trim kept on each side of every job strip nested on a roll'
+    )
+
+    # Results
+    job_count = fields.Integer(
+        string='Nested Jobs',
+        readonly=True
+    )
+
+    nested_rolls = fields.Integer(
+        string='Nested Rolls',
+        readonly=True,
+        help='Standard rolls needed when compatible jobs share rolls'
+    )
+
+    standalone_rolls = fields.Integer(
+        string='Standalone Rolls',
+        readonly=True,
+        help='Standard rolls needed when every job runs on its own rolls'
+    )
+
+    lower_bound_rolls = fields.Integer(
+        string='Lower Bound (rolls)',
+        readonly=True,
+        help='No packing can use fewer rolls than this'
+    )
+
+    saved_area_sqm = fields.Float(
+        string='Material Saved (m²)',
+        readonly=True
+    )
+
+    saved_cost = fields.Float(
+        string='Cost Saved (€)',
+        readonly=True
+    )
+
+    report_data = fields.Text(
+        string='Report Data',
+        readonly=True
+    )
+
+    report_html = fields.Html(
+        string='Report HTML',
+        readonly=True
+    )
+
+    @timed()
+    def action_optimize(self):
+        """Nest accepted quotations onto standard roll widths"""
+        self.ensure_one()
+
+        domain = [('state', '=', 'accepted')]
+        if self.material_ids:
+            domain.append(('carta_id', 'in', self.material_ids.ids))
+        if self.machine_ids:
+            domain.append(('macchina_id', 'in', self.machine_ids.ids))
+
+        quotations = self.env['label.quotation'].search(domain)
+        report_data = self._nest_quotations(quotations)
+
+        summary = report_data['summary']
+        self.write({
+            'job_count': summary['nested_jobs'],
+            'nested_rolls': summary['nested_rolls'],
+            'standalone_rolls': summary['standalone_rolls'],
+            'lower_bound_rolls': summary['lower_bound_rolls'],
+            'saved_area_sqm': summary['saved_area_sqm'],
+            'saved_cost': summary['saved_cost'],
+            'report_data': str(report_data),
+            'report_html': self.env['production.analysis.report']._convert_to_html(report_data),
+        })
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'production.nesting.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+            'context': self.env.context,
+        }
+
+    def _strip_width(self, quotation):
+        """Width of the job across the roll: its label tracks plus the wizard trim
+
+        Built from the label inputs rather than ``web_width``, which already
+        includes the quotation's own fixed edge margin.
+        """
+        tracks = quotation.tracks or 0
+        if not tracks or not quotation.label_width:
+            return 0.0
+        band = quotation.label_width * tracks + (quotation.interspace or 0) * (tracks - 1)
+        return band + 2 * self.edge_margin
+
+    def _group_quotations(self, quotations):
+        """Group quotations sharing a material and a die-compatible machine"""
+        groups = {}
+        skipped = self.env['label.quotation']
+        for quotation in quotations:
+            machine = quotation.macchina_id
+            die = quotation.fustella_id
+            if machine.supported_die_types and die not in machine.supported_die_types:
+                skipped |= quotation
+                continue
+            groups.setdefault((quotation.carta_id, machine), self.env['label.quotation'])
+            groups[(quotation.carta_id, machine)] |= quotation
+        return groups, skipped
+
+    def _nest_quotations(self, quotations):
+        """Solve one cutting-stock problem per material/machine group"""
+        groups, skipped = self._group_quotations(quotations)
+
+        report_data = {
+            'title': 'Roll Nesting Report',
+            'period': _('Accepted quotations'),
+            'summary': {},
+            'details': []
+        }
+
+        totals = Counter()
+        for (carta, machine), group in groups.items():
+            roll_width = carta.roll_width_standard or carta.max_width
+            roll_length = carta.roll_length_standard
+            if not roll_width or not roll_length:
+                totals['skipped_jobs'] += len(group)
+                continue
+
+            usable_width = roll_width
+            if machine.max_web_width:
+                usable_width = min(usable_width, machine.max_web_width)
+
+            strips = []
+            for quotation in group:
+                strip_width = self._strip_width(quotation)
+                if strip_width <= 0 or strip_width > usable_width or not quotation.linear_length:
+                    totals['skipped_jobs'] += 1
+                    continue
+                demand = math.ceil(quotation.linear_length / roll_length)
+                strips.append((quotation.id, strip_width, demand))
+
+            if not strips:
+                continue
+
+            rolls = first_fit_decreasing(strips, usable_width)
+            lower_bound = rolls_lower_bound(strips, usable_width)
+            standalone = sum(demand for __, __, demand in strips)
+
+            roll_area = roll_width / 1000 * roll_length
+            saved_area = (standalone - len(rolls)) * roll_area
+            used_width = sum(width * demand for __, width, demand in strips)
+
+            totals['nested_jobs'] += len(strips)
+            totals['nested_rolls'] += len(rolls)
+            totals['standalone_rolls'] += standalone
+            totals['lower_bound_rolls'] += lower_bound
+            totals['saved_area_sqm'] += saved_area
+            totals['saved_cost'] += saved_area * (carta.cost_per_sqm or 0)
+
+            report_data['details'].append({
+                'material': carta.name,
+                'machine': machine.name,
+                'jobs': len(strips),
+                'roll_width': roll_width,
+                'nested_rolls': len(rolls),
+                'standalone_rolls': standalone,
+                'lower_bound': lower_bound,
+                'width_utilization': round(used_width / (len(rolls) * usable_width) * 100, 2) if rolls else 0,
+                'saved_area_sqm': round(saved_area, 2),
+            })
+
+        report_data['summary'] = {
+            'nested_jobs': totals['nested_jobs'],
+            'skipped_jobs': totals['skipped_jobs'] + len(skipped),
+            'nested_rolls': totals['nested_rolls'],
+            'standalone_rolls': totals['standalone_rolls'],
+            'lower_bound_rolls': totals['lower_bound_rolls'],
+            'saved_area_sqm': round(totals['saved_area_sqm'], 2),
+            'saved_cost': round(totals['saved_cost'], 2),
+        }
+
+        return report_data
+
+    @api.constrains('edge_margin')
+    def _check_edge_margin(self):
+        """Validate edge margin"""
+        for record in self:
+            if record.edge_margin < 0:
+                raise ValidationError(_('Edge margin cannot be negative.'))
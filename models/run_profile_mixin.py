@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from contextlib import contextmanager
+
+from odoo import models, fields, _
+
+from ..tools import StackSampler
+
+
+class LabelRunProfileMixin(models.AbstractModel):
+    _name = 'label.run.profile.mixin'
+    _description = 'Profile This Run'
+
+    profile_run = fields.Boolean(
+        string='Profile This Run',
+        help='Capture a sampling profile of the next run and attach it as a flamegraph file'
+    )
+
+    profile_attachment_id = fields.Many2one(
+        'ir.attachment',
+        string='Run Profile',
+        readonly=True,
+        help='Collapsed stacks of the last profiled run, readable by flamegraph.pl or speedscope'
+    )
+
+    @contextmanager
+    def _profile_run(self, run_name):
+        """Profile the enclosed block when the switch is on
+
+        The collapsed stacks are stored as an attachment on the wizard.
+        """
+        self.ensure_one()
+        if not self.profile_run:
+            yield
+            return
+
+        with StackSampler() as sampler:
+            yield
+
+        timestamp = fields.Datetime.now().strftime('%Y%m%d-%H%M%S')
+        attachment = self.env['ir.attachment'].create({
+            'name': f'{run_name}-{timestamp}.folded',
+            'raw': sampler.collapsed().encode(),
+            'mimetype': 'text/plain',
+            'res_model': self._name,
+            'res_id': self.id,
+            'description': _('%(samples)s samples over %(duration).2fs',
+                             samples=sum(sampler.samples.values()), duration=sampler.duration),
+        })
+        self.profile_attachment_id = attachment
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api, _
+from odoo.tools import SQL
 
 
 class SaleOrder(models.Model):
@@ -42,6 +43,11 @@ class SaleOrder(models.Model):
             else:
                 order.label_quotation_count = 0
 
+    def action_confirm(self):
+        """Take the label snapshot of the order lines at confirmation"""
+        self.env['sale.order.line']._propagate_label_values(order_ids=self.ids)
+        return super().action_confirm()
+
     def action_view_label_quotations(self):
         """View label quotations for this customer"""
         action = self.env.ref('label_quotation.action_label_quotation').read()[0]
@@ -83,21 +89,22 @@ class SaleOrderLine(models.Model):
         store=True
     )
     
+    # Denormalised quotation values, kept up to date by _propagate_label_values()
     label_width = fields.Float(
         string='Label Width (mm)',
-        related='label_quotation_id.label_width',
+        compute='_compute_label_values',
         store=True
     )
     
     label_height = fields.Float(
         string='Label Height (mm)',
-        related='label_quotation_id.label_height',
+        compute='_compute_label_values',
         store=True
     )
     
     label_material = fields.Char(
         string='Label Material',
-        related='label_quotation_id.carta_id.name',
+        compute='_compute_label_values',
         store=True
     )
 
@@ -106,3 +113,57 @@ class SaleOrderLine(models.Model):
         """Check if this line is for label production"""
         for line in self:
             line.is_label_line = bool(line.label_quotation_id)
+
+    @api.depends('label_quotation_id')
+    def _compute_label_values(self):
+        """Copy label values from the quotation when the line is linked to it"""
+        for line in self:
+            quotation = line.label_quotation_id
+            line.label_width = quotation.label_width
+            line.label_height = quotation.label_height
+            line.label_material = quotation.carta_id.name
+
+    @api.model
+    def _propagate_label_values(self, quotation_ids=None, carta_ids=None, order_ids=None):
+        """Refresh the label values of order lines with a single UPDATE ... FROM
+
+        Lines are selected by quotation, material or order. Lines of confirmed
+        orders keep their values for companies configured to snapshot them at
+        confirmation.
+        """
+        if quotation_ids is not None:
+            column, ids = SQL.identifier('quotation', 'id'), quotation_ids
+        elif carta_ids is not None:
+            column, ids = SQL.identifier('quotation', 'carta_id'), carta_ids
+        else:
+            column, ids = SQL.identifier('line', 'order_id'), order_ids
+        if not ids:
+            return
+
+        snapshot_company_ids = self.env['label.config'].sudo().search([
+            ('sale_line_label_sync', '=', 'snapshot'),
+        ]).company_id.ids
+
+        self.env['label.quotation'].flush_model(['label_width', 'label_height', 'carta_id'])
+        self.env['label.carta'].flush_model(['name'])
+        self.env['sale.order'].flush_model(['state'])
+        self.flush_model(['label_quotation_id', 'label_width', 'label_height', 'label_material'])
+
+        self.env.cr.execute(SQL("""
+            UPDATE sale_order_line AS line
+               SET label_width = quotation.label_width,
+                   label_height = quotation.label_height,
+                   label_material = carta.name
+              FROM sale_order AS sale,
+                   label_quotation AS quotation
+         LEFT JOIN label_carta AS carta ON carta.id = quotation.carta_id
+             WHERE line.order_id = sale.id
+               AND line.label_quotation_id = quotation.id
+               AND %(column)s IN %(ids)s
+               AND NOT (sale.state = 'sale' AND line.company_id = ANY(%(company_ids)s))
+               AND (line.label_width IS DISTINCT FROM quotation.label_width
+                    OR line.label_height IS DISTINCT FROM quotation.label_height
+                    OR line.label_material IS DISTINCT FROM carta.name)
+        """, column=column, ids=tuple(ids), company_ids=snapshot_company_ids))
+        if self.env.cr.rowcount:
+            self.invalidate_model(['label_width', 'label_height', 'label_material'])
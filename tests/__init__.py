@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+from . import test_perf_benchmarks
+from . import test_query_budgets
+from . import test_perf_index_plans
+from . import test_production_schedule
+from . import test_roll_nesting
+from . import test_data_creation
+from . import test_price_simulation
+from . import test_quotation_revision
+from . import test_quotation_archive
+from . import test_quotation_approval
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from odoo import release
+from odoo.tests.common import TransactionCase
+
+_logger = logging.getLogger(__name__)
+
+# Multiplies every dataset size; raise it on a dedicated benchmark database
+SCALE = float(os.environ.get('LABEL_QUOTATION_BENCHMARK_SCALE', 1))
+# When set, the JSON results are also written to this file
+OUTPUT = os.environ.get('LABEL_QUOTATION_BENCHMARK_OUTPUT')
+
+
+def scaled(size):
+    """Dataset size adjusted to the benchmark scale"""
+    return max(1, int(size * SCALE))
+
+
+class LabelTestCase(TransactionCase):
+    """Common fixture for label_quotation tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Synthetic jobs are not tuned for yield; keep the yield constraint out of the way
+        cls.env['label.config'].get_config().min_yield_percentage = 0
+
+    @classmethod
+    def generate_dataset(cls, **sizes):
+        """Seeded benchmark dataset, sizes scaled by the benchmark scale"""
+        sizes = {name: scaled(size) for name, size in sizes.items()}
+        return cls.env['label.data.generator'].generate(**sizes)
+
+
+class LabelBenchmarkCase(LabelTestCase):
+    """Base class for label_quotation benchmarks
+
+    Each measurement records wall time, SQL query count and peak Python
+    memory; the results of a class are emitted as one JSON document when it
+    finishes so runs can be compared between releases.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.benchmark_results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        document = {
+            'suite': f'{cls.__module__}.{cls.__name__}',
+            'odoo_version': release.version,
+            'scale': SCALE,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': cls.benchmark_results,
+        }
+        payload = json.dumps(document, indent=2, sort_keys=True, default=str)
+        _logger.info("label_quotation benchmark results:\n%s", payload)
+        if OUTPUT:
+            with open(OUTPUT, 'a', encoding='utf-8') as output:
+                output.write(json.dumps(document, sort_keys=True, default=str) + '\n')
+        super().tearDownClass()
+
+    @contextmanager
+    def measure(self, name, **params):
+        """Measure the enclosed block and record it under ``name``
+
+        The ORM is flushed inside the measurement so deferred writes and
+        recomputes are charged to the block that caused them.
+        """
+        cr = self.env.cr
+        self.env.flush_all()
+        queries_before = cr.sql_log_count
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+            self.env.flush_all()
+        finally:
+            wall_time = time.perf_counter() - started
+            __, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            self.benchmark_results.append({
+                'name': name,
+                'params': params,
+                'wall_time_s': round(wall_time, 6),
+                'queries': cr.sql_log_count - queries_before,
+                'peak_memory_kib': round(peak / 1024, 1),
+            })
+
+
+class LabelQueryBudgetCase(LabelTestCase):
+    """Base class checking SQL query counts against declared budgets
+
+    A budget is a ``(fixed, per_record)`` pair: an operation on ``n`` records
+    may issue at most ``fixed + per_record * n`` queries. Operations are
+    measured on several batch sizes and ``assertQueryGrowth`` then checks
+    that the count grows by no more than ``per_record`` per extra record,
+    up to ``QUERY_GROWTH_TOLERANCE``, which catches N+1 patterns that the
+    fixed part of a budget would hide.
+
+    Chatter tracking and activity notifications are disabled: the mail
+    module writes them record by record, the budgets cover this module's
+    own queries.
+    """
+
+    # {operation: (fixed, per_record)}, declared by subclasses
+    QUERY_BUDGETS = {}
+    # Extra queries allowed between the smallest and the largest batch
+    QUERY_GROWTH_TOLERANCE = 2
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(
+            cls.env.context,
+            tracking_disable=True,
+            mail_notrack=True,
+            mail_activity_quick_update=True,
+        ))
+
+    def setUp(self):
+        super().setUp()
+        # {operation: {records: queries}}
+        self.query_counts = {}
+
+    @contextmanager
+    def assertQueryBudget(self, operation, records=1):
+        """Fail when the enclosed block exceeds the budget of ``operation``"""
+        fixed, per_record = self.QUERY_BUDGETS[operation]
+        budget = fixed + per_record * records
+        cr = self.env.cr
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries_before = cr.sql_log_count
+        yield
+        self.env.flush_all()
+        count = cr.sql_log_count - queries_before
+        self.query_counts.setdefault(operation, {})[records] = count
+        _logger.info("Query budget %s (%s records): %s/%s queries", operation, records, count, budget)
+        self.assertLessEqual(
+            count, budget,
+            f"{operation} on {records} record(s) ran {count} queries, budget is {budget}",
+        )
+
+    def assertQueryGrowth(self, operation):
+        """Fail when the queries of ``operation`` grow faster than its per-record budget"""
+        counts = self.query_counts.get(operation, {})
+        self.assertGreaterEqual(len(counts), 2, f"{operation} was not measured on two batch sizes")
+        __, per_record = self.QUERY_BUDGETS[operation]
+        smallest, largest = min(counts), max(counts)
+        growth = counts[largest] - counts[smallest]
+        allowed = per_record * (largest - smallest) + self.QUERY_GROWTH_TOLERANCE
+        self.assertLessEqual(
+            growth, allowed,
+            f"{operation} ran {counts[smallest]} queries on {smallest} record(s) and "
+            f"{counts[largest]} on {largest}, growth is {growth}, at most {allowed} allowed",
+        )
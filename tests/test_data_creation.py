@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import ValidationError
+from odoo.tests import tagged
+
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestDataCreation(LabelTestCase):
+    """Dataset upserts go through the ORM"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.DataCreation = cls.env['data.creation']
+        cls.DataCreation.load_dataset({
+            'materials': [{'default_code': 'TEST-UPSERT-MAT', 'name': 'Upsert Material', 'waste_factor': 5}],
+            'machines': [{'default_code': 'TEST-UPSERT-MACH', 'name': 'Upsert Machine', 'efficiency_factor': 0.8}],
+        })
+
+    def test_update_writes_changed_values(self):
+        stats = self.DataCreation.load_dataset({
+            'materials': [{'default_code': 'TEST-UPSERT-MAT', 'name': 'Upsert Material', 'waste_factor': 8}],
+        })
+        self.assertEqual(stats['materials'], {'created': 0, 'updated': 1})
+        material = self.env['product.template'].search([('default_code', '=', 'TEST-UPSERT-MAT')])
+        self.assertEqual(material.waste_factor, 8)
+
+    def test_update_checks_constraints(self):
+        with self.assertRaises(ValidationError):
+            self.DataCreation.load_dataset({
+                'machines': [{'default_code': 'TEST-UPSERT-MACH', 'efficiency_factor': 1.5}],
+            })
+            self.env.flush_all()
+        with self.assertRaises(ValidationError):
+            self.DataCreation.load_dataset({
+                'materials': [{'default_code': 'TEST-UPSERT-MAT', 'waste_factor': 150}],
+            })
+            self.env.flush_all()
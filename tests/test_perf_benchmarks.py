@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import LabelBenchmarkCase, scaled
+
+
+@tagged('-standard', 'perf', 'post_install', '-at_install')
+class TestLabelQuotationBenchmarks(LabelBenchmarkCase):
+    """Hot path benchmarks, run with ``--test-tags perf``"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.dataset = cls.generate_dataset(
+            materials=20, machines=10, dies=100, quotations=2000, partners=100)
+        cls.quotations = cls.env['label.quotation'].browse(cls.dataset['quotation_ids'])
+        cls.cartas = cls.env['label.carta'].browse(cls.dataset['carta_ids'])
+        cls.machines = cls.env['label.macchina'].browse(cls.dataset['macchina_ids'])
+        cls.dies = cls.env['label.fustella'].browse(cls.dataset['fustella_ids'])
+
+    def test_create_throughput(self):
+        """Quotations created through the ORM, computes included"""
+        template = self.quotations[:1]
+        count = scaled(500)
+        vals_list = [{
+            'partner_id': template.partner_id.id,
+            'label_width': 40 + index % 60,
+            'label_height': 30 + index % 40,
+            'interspace': 3.2,
+            'tracks': 1 + index % 4,
+            'total_quantity': 10000 + index * 10,
+            'carta_id': self.cartas[index % len(self.cartas)].id,
+            'fustella_id': self.dies[index % len(self.dies)].id,
+            'macchina_id': self.machines[index % len(self.machines)].id,
+        } for index in range(count)]
+
+        with self.measure('quotation_create', records=count):
+            self.env['label.quotation'].create(vals_list)
+
+    def test_recompute_after_master_change(self):
+        """Cost recompute fan-out when quotations move to another material, machine or die
+
+        Quotation figures depend on the master record they use, not on its
+        prices, which keeps sent prices stable; moving quotations to another
+        record is what triggers their recompute.
+        """
+        # Lift the capacity limits so that any quotation may use any master record
+        self.cartas.write({'max_width': 530, 'max_length': 0, 'minimum_order_quantity': 0})
+        self.machines.write({'max_web_width': 5000, 'max_tracks': 10})
+        self.dies.write({'max_tracks': 10})
+        Quotation = self.env['label.quotation']
+
+        for fname, name, targets in [
+            ('carta_id', 'recompute_carta_swap', self.cartas),
+            ('macchina_id', 'recompute_machine_swap', self.machines),
+            ('fustella_id', 'recompute_die_swap', self.dies),
+        ]:
+            quotations = Quotation.search([(fname, '=', targets[0].id)])
+            with self.measure(name, records=len(quotations)):
+                quotations.write({fname: targets[1].id})
+
+    def test_find_optimal_configuration(self):
+        """Optimizer latency against the number of machines and dies"""
+        for machine_count, die_count in [(2, 10), (5, 50), (10, 100)]:
+            wizard = self.env['production.optimization.wizard'].create({
+                'label_width': 50,
+                'label_height': 30,
+                'total_quantity': 50000,
+                'carta_id': self.cartas[0].id,
+                'available_machines': [(6, 0, self.machines[:machine_count].ids)],
+                'available_dies': [(6, 0, self.dies[:die_count].ids)],
+            })
+            with self.measure('find_optimal_configuration', machines=machine_count, dies=die_count):
+                wizard._find_optimal_configuration()
+
+    def test_analysis_reports(self):
+        """Every analysis report type against the number of reported quotations"""
+        dates = sorted(self.quotations.mapped('date'))
+        report_types = [key for key, __ in self.env['production.analysis.report']._fields['report_type'].selection]
+        # The most recent tenth, half and all of the dataset
+        for share in (0.1, 0.5, 1.0):
+            date_from, date_to = dates[-max(1, int(len(dates) * share))], dates[-1]
+            rows = self.env['label.quotation'].search_count([
+                ('date', '>=', date_from),
+                ('date', '<=', date_to),
+                ('state', 'in', ['sent', 'accepted']),
+            ])
+            for report_type in report_types:
+                report = self.env['production.analysis.report'].create({
+                    'report_type': report_type,
+                    'date_from': date_from,
+                    'date_to': date_to,
+                })
+                with self.measure('analysis_report', report_type=report_type, rows=rows):
+                    report.action_generate_report()
+
+    def test_pdf_render(self):
+        """Quotation PDF rendering"""
+        quotation = self.quotations[0]
+        with self.measure('quotation_pdf'):
+            self.env['label.quotation.report'].generate_quotation_pdf(quotation.id)
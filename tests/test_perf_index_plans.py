@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from odoo.tests import tagged
+from odoo.tools import SQL
+
+from .common import LabelBenchmarkCase
+
+
+@tagged('-standard', 'perf', 'post_install', '-at_install')
+class TestAnalysisIndexPlans(LabelBenchmarkCase):
+    """Report and smart button query plans without and with the analysis indexes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.generate_dataset(
+            materials=50, machines=20, dies=500, quotations=50000, partners=500)
+        cls.quotations = cls.env['label.quotation'].browse(dataset['quotation_ids'])
+        cls.carta = cls.env['label.carta'].browse(dataset['carta_ids'][0])
+        cls.machine = cls.env['label.macchina'].browse(dataset['macchina_ids'][0])
+        cls.die = cls.env['label.fustella'].browse(dataset['fustella_ids'][0])
+        cls.env.cr.execute("ANALYZE label_quotation")
+
+    def _access_patterns(self):
+        dates = self.quotations[:1000].mapped('date')
+        date_from, date_to = min(dates), max(dates)
+        period = [('date', '>=', date_from), ('date', '<=', date_to)]
+        report = period + [('state', 'in', ['sent', 'accepted'])]
+        return {
+            'report_period': report,
+            'report_machine': report + [('macchina_id', 'in', self.machine.ids)],
+            'report_material': report + [('carta_id', 'in', self.carta.ids)],
+            'smart_button_carta': [('carta_id', '=', self.carta.id)],
+            'smart_button_fustella': [('fustella_id', '=', self.die.id)],
+            'smart_button_macchina': [('macchina_id', '=', self.machine.id)],
+        }
+
+    def _explain(self, domain):
+        query = self.env['label.quotation']._search(domain)
+        self.env.cr.execute(SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) %s", query.select()))
+        plan = self.env.cr.fetchone()[0]
+        plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+        return plan
+
+    @staticmethod
+    def _scans(node):
+        scans = [f"{node['Node Type']}{' on ' + node['Index Name'] if 'Index Name' in node else ''}"]
+        for child in node.get('Plans', []):
+            scans += TestAnalysisIndexPlans._scans(child)
+        return scans
+
+    def test_report_query_plans(self):
+        Quotation = self.env['label.quotation']
+        indexes = Quotation._get_analysis_indexes()
+        patterns = self._access_patterns()
+
+        plans = {}
+        with self.env.cr.savepoint(flush=False) as savepoint:
+            for indexname in indexes:
+                self.env.cr.execute(SQL("DROP INDEX IF EXISTS %s", SQL.identifier(indexname)))
+            for name, domain in patterns.items():
+                plans[name] = {'before': self._explain(domain)}
+            savepoint.rollback()
+
+        for name, domain in patterns.items():
+            plans[name]['after'] = self._explain(domain)
+
+        for name, plan in plans.items():
+            before, after = plan['before'], plan['after']
+            self.benchmark_results.append({
+                'name': 'analysis_query_plan',
+                'params': {'pattern': name, 'rows': len(self.quotations)},
+                'before': {
+                    'execution_ms': before['Execution Time'],
+                    'total_cost': before['Plan']['Total Cost'],
+                    'scans': self._scans(before['Plan']),
+                },
+                'after': {
+                    'execution_ms': after['Execution Time'],
+                    'total_cost': after['Plan']['Total Cost'],
+                    'scans': self._scans(after['Plan']),
+                },
+            })
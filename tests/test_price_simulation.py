@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+from ast import literal_eval
+from unittest import skipIf
+
+from odoo import Command
+from odoo.tests import tagged
+
+from ..models.price_simulation import np
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+@skipIf(np is None, 'The price simulation requires numpy')
+class TestPriceSimulation(LabelTestCase):
+    """What-if price simulation over the open backlog"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.generate_dataset(materials=3, machines=2, dies=10, quotations=50, partners=5)
+
+    def test_zero_delta_has_no_impact(self):
+        wizard = self.env['label.price.simulation.wizard'].create({})
+        wizard.action_simulate()
+        self.assertTrue(wizard.quotation_count)
+        self.assertAlmostEqual(wizard.simulated_cost, wizard.current_cost, places=2)
+        self.assertAlmostEqual(wizard.simulated_margin, wizard.current_margin, places=2)
+        self.assertAlmostEqual(wizard.margin_delta, 0, places=2)
+
+    def test_deltas_impact_their_material_and_machine(self):
+        backlog = self.env['label.quotation'].search([('state', 'in', ['draft', 'sent'])])
+        carta = backlog.carta_id[:1]
+        machine = backlog.macchina_id[:1]
+        wizard = self.env['label.price.simulation.wizard'].create({
+            'delta_ids': [
+                Command.create({
+                    'target': 'material',
+                    'carta_id': carta.id,
+                    'field_name': 'cost_per_sqm',
+                    'change_type': 'percent',
+                    'value': 10,
+                }),
+                Command.create({
+                    'target': 'machine',
+                    'macchina_id': machine.id,
+                    'field_name': 'production_cost_per_hour',
+                    'change_type': 'amount',
+                    'value': 20,
+                }),
+            ],
+        })
+        wizard.action_simulate()
+
+        # Only the price changes move the margin: 10% of the paper cost on the
+        # material, 20 € per production hour plus overhead on the machine
+        expected = {}
+        for quotation in backlog:
+            impact = 0.0
+            if quotation.carta_id == carta:
+                impact -= quotation.paper_cost * 0.1
+            if quotation.macchina_id == machine and quotation.linear_length:
+                speed = (machine.max_speed or 100) * (machine.efficiency_factor or 0.85)
+                production_hours = quotation.linear_length / (speed * 60)
+                impact -= production_hours * 20 * (1 + (machine.overhead_percentage or 0) / 100)
+            for group, name in (('Material', quotation.carta_id.display_name),
+                                ('Machine', quotation.macchina_id.display_name)):
+                expected[group, name] = expected.get((group, name), 0.0) + impact
+
+        details = {(row['group'], row['name']): row for row in literal_eval(wizard.report_data)['details']}
+        for group, record in (('Material', carta), ('Machine', machine)):
+            row = details[group, record.display_name]
+            self.assertLess(row['margin_delta'], 0)
+            self.assertAlmostEqual(row['margin_delta'], expected[group, record.display_name], places=1)
+        self.assertAlmostEqual(wizard.margin_delta, sum(
+            impact for (group, __), impact in expected.items() if group == 'Material'), places=1)
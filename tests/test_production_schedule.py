@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestProductionSchedule(LabelTestCase):
+    """Quotation costs follow the production plan"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.generate_dataset(materials=1, machines=1, dies=1, quotations=0, partners=1)
+        cls.partner = cls.env['res.partner'].browse(dataset['partner_ids'])
+        cls.carta = cls.env['label.carta'].browse(dataset['carta_ids'])
+        cls.die = cls.env['label.fustella'].browse(dataset['fustella_ids'])
+        cls.machine = cls.env['label.macchina'].browse(dataset['macchina_ids'])
+        cls.machine.write({
+            'setup_time': 30,
+            'die_change_time': 15,
+            'material_change_time': 10,
+            'warm_up_time': 5,
+            'max_web_width': 400,
+            'max_tracks': 8,
+        })
+        cls.carta.max_width = 330
+
+    def _create_quotations(self, count, state='accepted', die=None):
+        return self.env['label.quotation'].create([{
+            'partner_id': self.partner.id,
+            'state': state,
+            'label_width': 50,
+            'label_height': 30,
+            'interspace': 3,
+            'tracks': 2,
+            'total_quantity': 20000,
+            'carta_id': self.carta.id,
+            'fustella_id': (die or self.die).id,
+            'macchina_id': self.machine.id,
+        } for __ in range(count)])
+
+    def test_plan_keeps_accepted_prices(self):
+        accepted = self._create_quotations(2)
+        draft = self._create_quotations(1, state='draft')
+        prices = {quotation: (quotation.total_cost, quotation.selling_price) for quotation in accepted}
+        # An empty queue prices the draft with a full die and material change
+        unplanned_cost, unplanned_price = draft.total_cost, draft.selling_price
+
+        self.env['label.production.slot']._plan_machines(self.machine)
+        self.env.flush_all()
+        for quotation in accepted:
+            self.assertEqual((quotation.total_cost, quotation.selling_price), prices[quotation])
+        # Running after the planned batch, the draft only pays the plain setup
+        self.assertLess(draft.total_cost, unplanned_cost)
+        self.assertLess(draft.selling_price, unplanned_price)
+
+    def test_replan_keeps_accepted_prices(self):
+        self._create_quotations(2)
+        other_die = self.die.copy({'code': 'TEST-REPLAN-DIE'})
+        draft = self._create_quotations(1, state='draft', die=other_die)
+        self.env['label.production.slot']._plan_machines(self.machine)
+        planned = self.env['label.production.slot'].search([('macchina_id', '=', self.machine.id)])
+        head, follower = planned[0].quotation_id, planned[1].quotation_id
+        follower_price = (follower.total_cost, follower.selling_price)
+        draft_cost = draft.total_cost
+
+        # Moving the head job to the draft's die makes that die cheap to follow
+        head.fustella_id = other_die
+        self.env.flush_all()
+        self.assertEqual((follower.total_cost, follower.selling_price), follower_price)
+        self.assertLess(draft.total_cost, draft_cost)
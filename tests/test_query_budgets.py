@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import LabelQueryBudgetCase
+
+
+@tagged('post_install', '-at_install')
+class TestQueryBudgets(LabelQueryBudgetCase):
+    """Regression guards on the number of queries of the quotation flows"""
+
+    # Creates pay one sequence lookup and number per record, nothing else may grow with the batch
+    QUERY_BUDGETS = {
+        'quotation_create': (25, 2),
+        'quotation_write': (15, 0),
+        'quotation_send': (15, 0),
+        'quotation_accept': (20, 0),
+        'quotation_reject': (10, 0),
+        'quotation_cancel': (10, 0),
+        'approval_request': (20, 0),
+        'approval_decision': (15, 0),
+        'quotation_count': (3, 0),
+        'optimize': (20, 0),
+        'analysis_report': (25, 0),
+        'quotation_pdf': (15, 0),
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.env['label.data.generator'].generate(
+            materials=5, machines=3, dies=20, quotations=60, partners=10, seed=7)
+        cls.quotations = cls.env['label.quotation'].browse(dataset['quotation_ids'])
+        cls.cartas = cls.env['label.carta'].browse(dataset['carta_ids'])
+        cls.machines = cls.env['label.macchina'].browse(dataset['macchina_ids'])
+        cls.dies = cls.env['label.fustella'].browse(dataset['fustella_ids'])
+
+    def _quotation_vals(self, count):
+        return [{
+            'partner_id': self.quotations[0].partner_id.id,
+            'label_width': 50,
+            'label_height': 30,
+            'interspace': 3.2,
+            'tracks': 2,
+            'total_quantity': 20000 + index,
+            'carta_id': self.cartas[index % len(self.cartas)].id,
+            'fustella_id': self.dies[index % len(self.dies)].id,
+            'macchina_id': self.machines[index % len(self.machines)].id,
+        } for index in range(count)]
+
+    def test_quotation_create(self):
+        for count in (1, 10):
+            vals_list = self._quotation_vals(count)
+            with self.assertQueryBudget('quotation_create', count):
+                self.env['label.quotation'].create(vals_list)
+        self.assertQueryGrowth('quotation_create')
+
+    def test_quotation_write(self):
+        for count in (1, 10):
+            quotations = self.quotations.filtered(lambda q: q.state == 'draft')[:count]
+            with self.assertQueryBudget('quotation_write', len(quotations)):
+                quotations.write({'label_width': 45})
+        self.assertQueryGrowth('quotation_write')
+
+    def test_quotation_state_actions(self):
+        drafts = self.env['label.quotation'].create(self._quotation_vals(22))
+        for batch in (drafts[:1], drafts[1:11]):
+            with self.assertQueryBudget('quotation_send', len(batch)):
+                batch.action_send_quotation()
+            with self.assertQueryBudget('quotation_accept', len(batch)):
+                batch.action_accept_quotation()
+        for batch in (drafts[11:12], drafts[12:22]):
+            with self.assertQueryBudget('quotation_reject', len(batch)):
+                batch.action_reject_quotation()
+        drafts = self.env['label.quotation'].create(self._quotation_vals(11))
+        for batch in (drafts[:1], drafts[1:]):
+            with self.assertQueryBudget('quotation_cancel', len(batch)):
+                batch.action_cancel_quotation()
+        for operation in ('quotation_send', 'quotation_accept', 'quotation_reject', 'quotation_cancel'):
+            self.assertQueryGrowth(operation)
+
+    def test_quotation_approval(self):
+        self.env['label.config'].get_config().write({'require_approval': True, 'approval_threshold': 0})
+        drafts = self.env['label.quotation'].create(self._quotation_vals(11))
+        for batch in (drafts[:1], drafts[1:]):
+            with self.assertQueryBudget('approval_request', len(batch)):
+                batch.action_send_quotation()
+            self.assertEqual(set(batch.mapped('state')), {'draft'})
+            self.assertEqual(set(batch.mapped('approval_state')), {'pending'})
+            self.assertEqual(len(batch._get_approval_activities()), len(batch))
+            with self.assertQueryBudget('approval_decision', len(batch)):
+                batch.action_approve()
+            self.assertFalse(batch._get_approval_activities())
+            batch.action_send_quotation()
+            self.assertEqual(set(batch.mapped('state')), {'sent'})
+        self.assertQueryGrowth('approval_request')
+        self.assertQueryGrowth('approval_decision')
+
+    def test_quotation_count(self):
+        for records in (self.cartas, self.machines, self.dies):
+            with self.assertQueryBudget('quotation_count'):
+                records.mapped('quotation_count')
+
+    def test_optimize(self):
+        for die_count in (5, 20):
+            wizard = self.env['production.optimization.wizard'].create({
+                'label_width': 50,
+                'label_height': 30,
+                'total_quantity': 50000,
+                'carta_id': self.cartas[0].id,
+                'available_machines': [(6, 0, self.machines.ids)],
+                'available_dies': [(6, 0, self.dies[:die_count].ids)],
+            })
+            with self.assertQueryBudget('optimize', die_count):
+                wizard.action_optimize()
+        self.assertQueryGrowth('optimize')
+
+    def test_analysis_reports(self):
+        dates = self.quotations.mapped('date')
+        report_types = [key for key, __ in self.env['production.analysis.report']._fields['report_type'].selection]
+        for report_type in report_types:
+            report = self.env['production.analysis.report'].create({
+                'report_type': report_type,
+                'date_from': min(dates),
+                'date_to': max(dates),
+            })
+            with self.assertQueryBudget('analysis_report'):
+                report.action_generate_report()
+
+    def test_quotation_pdf(self):
+        with self.assertQueryBudget('quotation_pdf'):
+            self.env['label.quotation.report'].generate_quotation_pdf(self.quotations[0].id)
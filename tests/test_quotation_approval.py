@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestQuotationApproval(LabelTestCase):
+    """Quotations above the threshold wait for an approval of their current figures"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.generate_dataset(materials=1, machines=1, dies=1, quotations=0, partners=1)
+        cls.env['label.config'].get_config().write({'require_approval': True, 'approval_threshold': 0})
+        cls.quotation = cls.env['label.quotation'].create({
+            'partner_id': dataset['partner_ids'][0],
+            'label_width': 50,
+            'label_height': 30,
+            'interspace': 3,
+            'tracks': 2,
+            'total_quantity': 20000,
+            'carta_id': dataset['carta_ids'][0],
+            'fustella_id': dataset['fustella_ids'][0],
+            'macchina_id': dataset['macchina_ids'][0],
+        })
+
+    def test_price_change_voids_approval(self):
+        self.quotation.action_send_quotation()
+        self.assertEqual(self.quotation.approval_state, 'pending')
+        self.quotation.action_approve()
+
+        self.quotation.total_quantity = 40000
+        self.assertFalse(self.quotation.approval_state)
+        self.assertFalse(self.quotation.approved_by_id)
+        self.quotation.action_send_quotation()
+        self.assertEqual(self.quotation.state, 'draft')
+        self.assertEqual(self.quotation.approval_state, 'pending')
+
+    def test_refused_stays_blocked_until_edited(self):
+        self.quotation.action_send_quotation()
+        self.quotation.action_refuse_approval()
+
+        self.quotation.action_send_quotation()
+        self.assertEqual(self.quotation.state, 'draft')
+        self.assertEqual(self.quotation.approval_state, 'refused')
+        self.assertFalse(self.quotation._get_approval_activities())
+
+        self.quotation.margin_percentage += 5
+        self.quotation.action_send_quotation()
+        self.assertEqual(self.quotation.approval_state, 'pending')
+        self.assertTrue(self.quotation._get_approval_activities())
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestQuotationArchive(LabelTestCase):
+    """Closed quotations move to cold storage, die wear stays"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.generate_dataset(materials=1, machines=1, dies=1, quotations=0, partners=1)
+        cls.die = cls.env['label.fustella'].browse(dataset['fustella_ids'])
+        cls.env['label.config'].get_config().write({
+            'archive_horizon_days': 30,
+            'require_approval': False,
+        })
+        cls.quotation = cls.env['label.quotation'].create({
+            'partner_id': dataset['partner_ids'][0],
+            'state': 'accepted',
+            'date': fields.Date.today() - timedelta(days=90),
+            'label_width': 50,
+            'label_height': 30,
+            'interspace': 3,
+            'tracks': 2,
+            'total_quantity': 20000,
+            'carta_id': dataset['carta_ids'][0],
+            'fustella_id': cls.die.id,
+            'macchina_id': dataset['macchina_ids'][0],
+        })
+
+    def test_cron_archives_accepted_quotation_and_keeps_die_wear(self):
+        usage = self.env['label.fustella.usage'].search([('quotation_id', '=', self.quotation.id)])
+        self.assertTrue(usage.cuts)
+        usage.action_register_usage()
+        used_cuts = self.die.current_usage_count
+        name, date, quotation_id = self.quotation.name, self.quotation.date, self.quotation.id
+
+        self.env['label.quotation.archive']._cron_archive_quotations()
+
+        self.assertFalse(self.quotation.exists())
+        archive = self.env['label.quotation.archive'].search([('original_id', '=', quotation_id)])
+        self.assertEqual(archive.name, name)
+        self.assertEqual(archive.state, 'accepted')
+
+        self.assertTrue(usage.exists())
+        self.assertFalse(usage.quotation_id)
+        self.assertEqual((usage.quotation_name, usage.quotation_date), (name, date))
+        self.assertEqual(usage.state, 'done')
+        self.assertEqual(self.die.current_usage_count, used_cuts)
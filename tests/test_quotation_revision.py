@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestQuotationRevision(LabelTestCase):
+    """Revisions store their changes and become quotations when sent"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataset = cls.generate_dataset(materials=1, machines=1, dies=1, quotations=0, partners=1)
+        cls.config = cls.env['label.config'].get_config()
+        cls.config.require_approval = False
+        cls.quotation = cls.env['label.quotation'].create({
+            'partner_id': dataset['partner_ids'][0],
+            'label_width': 50,
+            'label_height': 30,
+            'interspace': 3,
+            'tracks': 2,
+            'total_quantity': 20000,
+            'carta_id': dataset['carta_ids'][0],
+            'fustella_id': dataset['fustella_ids'][0],
+            'macchina_id': dataset['macchina_ids'][0],
+        })
+
+    def _create_revision(self, **inputs):
+        revision = self.env['label.quotation.revision'].create({'quotation_id': self.quotation.id})
+        revision.write(inputs)
+        return revision
+
+    def test_revision_numbering(self):
+        Revision = self.env['label.quotation.revision']
+        first, second = Revision.create([{'quotation_id': self.quotation.id}] * 2)
+        third = Revision.create({'quotation_id': self.quotation.id})
+        self.assertEqual((first.revision_number, second.revision_number, third.revision_number), (1, 2, 3))
+        self.assertEqual(third.name, f'{self.quotation.name}-R3')
+
+        other = self.quotation.copy()
+        self.assertEqual(Revision.create({'quotation_id': other.id}).revision_number, 1)
+
+    def test_changes_keep_only_differences(self):
+        revision = self._create_revision(label_width=60, label_height=30)
+        self.assertEqual(revision.changes, {'label_width': 60})
+        self.assertEqual(revision.label_height, 30)
+
+        # Inputs not changed follow the quotation
+        self.quotation.label_height = 40
+        self.assertEqual(revision.label_height, 40)
+
+        revision.label_width = 50
+        self.assertFalse(revision.changes)
+
+    def test_send_creates_quotation(self):
+        revision = self._create_revision(total_quantity=40000)
+        revision.action_send()
+        sent = revision.sent_quotation_id
+        self.assertEqual(revision.state, 'sent')
+        self.assertEqual(sent.state, 'sent')
+        self.assertEqual(sent.total_quantity, 40000)
+        self.assertEqual(sent.label_width, self.quotation.label_width)
+        self.assertEqual(self.quotation.total_quantity, 20000)
+
+    def test_send_held_reuses_quotation_with_current_inputs(self):
+        self.config.write({'require_approval': True, 'approval_threshold': 0})
+        revision = self._create_revision(total_quantity=40000)
+        revision.action_send()
+        held = revision.sent_quotation_id
+        self.assertEqual(revision.state, 'draft')
+        self.assertEqual(held.state, 'draft')
+        self.assertEqual(held.approval_state, 'pending')
+
+        # Sent again once approved, the held quotation carries the later change,
+        # which voids the approval given to the earlier figures
+        revision.total_quantity = 50000
+        held.action_approve()
+        revision.action_send()
+        self.assertEqual(revision.sent_quotation_id, held)
+        self.assertEqual(held.total_quantity, 50000)
+        self.assertEqual(held.state, 'draft')
+        self.assertEqual(held.approval_state, 'pending')
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase
+
+from ..models.roll_nesting import _ResidualTree, first_fit_decreasing, rolls_lower_bound
+from .common import LabelTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestRollPacking(BaseCase):
+    """First-fit decreasing packing of job strips on standard rolls"""
+
+    def test_residual_tree_first_fit(self):
+        tree = _ResidualTree(4, 100)
+        self.assertEqual(tree.first_fit(100), 0)
+        tree.consume(0, 70)
+        tree.consume(1, 20)
+        self.assertEqual(tree.residual(0), 30)
+        # The lowest roll with enough room wins
+        self.assertEqual(tree.first_fit(30), 0)
+        self.assertEqual(tree.first_fit(31), 1)
+        self.assertEqual(tree.first_fit(90), 2)
+        self.assertIsNone(tree.first_fit(101))
+
+    def test_first_fit_decreasing(self):
+        strips = [('a', 60, 1), ('b', 40, 1), ('c', 50, 2)]
+        rolls = first_fit_decreasing(strips, 100)
+        self.assertEqual(rolls, [['a', 'b'], ['c', 'c']])
+        self.assertEqual(rolls_lower_bound(strips, 100), 2)
+
+    def test_oversized_and_empty_strips(self):
+        rolls = first_fit_decreasing([('wide', 120, 2), ('none', 30, 0), ('ok', 30, 1)], 100)
+        self.assertEqual(rolls, [['ok']])
+
+    def test_lower_bound_large_items(self):
+        strips = [('x', 60, 3)]
+        # Two strips over half the roll never share one
+        self.assertEqual(rolls_lower_bound(strips, 100), 3)
+        self.assertEqual(len(first_fit_decreasing(strips, 100)), 3)
+
+
+@tagged('post_install', '-at_install')
+class TestRollNesting(LabelTestCase):
+    """Job strips of the nesting wizard"""
+
+    def test_strip_width_uses_wizard_margin(self):
+        wizard = self.env['production.nesting.wizard'].new({'edge_margin': 7})
+        quotation = self.env['label.quotation'].new({
+            'label_width': 50,
+            'label_height': 30,
+            'tracks': 3,
+            'interspace': 3,
+        })
+        # Three 50 mm tracks, two 3 mm gaps and 7 mm of trim on each side
+        self.assertEqual(wizard._strip_width(quotation), 170)
+        wizard.edge_margin = 0
+        self.assertEqual(wizard._strip_width(quotation), 156)
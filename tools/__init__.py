@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from .timing import (
+    timed,
+    timed_block,
+    get_timing_stats,
+    reset_timing_stats,
+    set_timing_enabled,
+    is_timing_enabled,
+)
+from .profiling import StackSampler
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Sampling profiler producing collapsed stacks
+
+The output is the "folded" format read by flamegraph.pl, speedscope and
+most flamegraph viewers: one line per distinct stack, frames separated by
+semicolons from the outermost call, followed by the number of samples.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Sampling period in seconds
+DEFAULT_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Sample the stack of the calling thread from a background thread
+
+    Usage::
+
+        with StackSampler() as sampler:
+            run()
+        folded = sampler.collapsed()
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.duration = 0.0
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._sampler = None
+        self._started = None
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name='label-quotation-profiler', daemon=True)
+        self._started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.samples[self._stack(frame)] += 1
+
+    @staticmethod
+    def _stack(frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            filename = '/'.join(code.co_filename.split(os.sep)[-2:])
+            frames.append(f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ','))
+            frame = frame.f_back
+        return ';'.join(reversed(frames))
+
+    def collapsed(self):
+        """Samples in collapsed stack format, heaviest stacks first"""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.samples.most_common()) + '\n'
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Per-worker timing of the label quotation hot paths
+
+Enable with ``label_quotation_timing = True`` in the Odoo configuration
+file (or at runtime with :func:`set_timing_enabled`). When disabled, a
+timed call costs a single attribute check.
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+
+from odoo.tools import config, str2bool
+
+# Samples kept per entry point for the percentiles
+SAMPLE_SIZE = 1000
+
+
+class _TimingState:
+    enabled = str2bool(str(config.get('label_quotation_timing', False)), default=False)
+    lock = threading.Lock()
+    stats = {}
+
+
+def set_timing_enabled(enabled):
+    """Switch the timing hooks on or off for this worker
+
+    ``enabled`` may be a boolean or a string such as ``"false"`` or ``"0"``.
+    """
+    _TimingState.enabled = str2bool(str(enabled), default=False)
+
+
+def is_timing_enabled():
+    return _TimingState.enabled
+
+
+def _record(name, elapsed):
+    with _TimingState.lock:
+        entry = _TimingState.stats.get(name)
+        if entry is None:
+            entry = _TimingState.stats[name] = {
+                'count': 0,
+                'total': 0.0,
+                'max': 0.0,
+                'samples': deque(maxlen=SAMPLE_SIZE),
+            }
+        entry['count'] += 1
+        entry['total'] += elapsed
+        entry['max'] = max(entry['max'], elapsed)
+        entry['samples'].append(elapsed)
+
+
+class timed_block:
+    """Context manager timing the enclosed block under ``name``"""
+
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if _TimingState.enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.started is not None:
+            _record(self.name, time.perf_counter() - self.started)
+
+
+def timed(name=None):
+    """Decorator timing every call of a method
+
+    Place it below the ``api`` decorators; the attributes they set are
+    carried over to the wrapper.
+    """
+    def decorator(method):
+        label = name or method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not _TimingState.enabled:
+                return method(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _record(label, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an ordered list"""
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def get_timing_stats():
+    """Aggregated timings of this worker, in milliseconds
+
+    :return: ``{name: {count, total_ms, mean_ms, max_ms, p50_ms, p90_ms, p99_ms}}``;
+        percentiles are computed over the last ``SAMPLE_SIZE`` calls
+    """
+    with _TimingState.lock:
+        snapshot = {
+            name: (entry['count'], entry['total'], entry['max'], sorted(entry['samples']))
+            for name, entry in _TimingState.stats.items()
+        }
+
+    stats = {}
+    for name, (count, total, maximum, samples) in snapshot.items():
+        stats[name] = {
+            'count': count,
+            'total_ms': round(total * 1000, 3),
+            'mean_ms': round(total / count * 1000, 3),
+            'max_ms': round(maximum * 1000, 3),
+            'p50_ms': round(_percentile(samples, 0.50) * 1000, 3),
+            'p90_ms': round(_percentile(samples, 0.90) * 1000, 3),
+            'p99_ms': round(_percentile(samples, 0.99) * 1000, 3),
+        }
+    return stats
+
+
+def reset_timing_stats():
+    """Drop the timings collected by this worker"""
+    with _TimingState.lock:
+        _TimingState.stats.clear()